@@ -0,0 +1,78 @@
+from pathlib import Path
+from shutil import copyfile
+from os import stat, utime
+from concurrent.futures import ThreadPoolExecutor
+from windows.base_window import get_tk_root
+
+# Worker threads used for bulk file copies
+MAX_COPY_WORKERS = 4
+
+IMAGE_FILETYPES = [
+    ("Image files", "*.png *.jpg *.jpeg *.bmp *.gif *.tiff *.webp"),
+    ("All files", "*.*")
+]
+
+def copy_files(file_pairs, preserve_times: bool = True) -> int:
+    """
+    Copy files in parallel, preserving only the file times
+
+    Args:
+        file_pairs: List of (source, destination) path tuples
+        preserve_times: Copy access/modification times to the destination
+
+    Returns:
+        Number of copied files
+    """
+    if not file_pairs:
+        return 0
+    def copy_file(pair):
+        source, destination = pair
+        copyfile(source, destination)
+        if not preserve_times:
+            return
+        source_stat = stat(source)
+        utime(destination, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    workers = min(MAX_COPY_WORKERS, len(file_pairs))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(copy_file, file_pairs):
+            pass
+    return len(file_pairs)
+
+def load_images_into(working_dir: Path, file_viewer) -> None:
+    """
+    Ask for image files and copy them into a working directory
+
+    The copies are temporary files owned by the app, so their file times
+    are not preserved. Each copied file is added to the file viewer.
+
+    Args:
+        working_dir: Directory the images are copied into
+        file_viewer: FileViewer showing the working directory
+    """
+    try:
+        from tkinter import filedialog
+        root = get_tk_root()
+        working_dir_exists = working_dir.exists()
+        initial_dir = str(working_dir) if working_dir_exists else None
+        filepaths = filedialog.askopenfilenames(
+            title="Select Images to Load",
+            filetypes=IMAGE_FILETYPES,
+            initialdir=initial_dir
+        )
+        root.update()
+        if not filepaths:
+            return
+        if not working_dir_exists:
+            working_dir.mkdir(parents=True, exist_ok=True)
+        file_pairs = []
+        for filepath in filepaths:
+            source_file = Path(filepath)
+            file_pairs.append((source_file, working_dir / source_file.name))
+        count = copy_files(file_pairs, preserve_times=False)
+        if count > 0:
+            print(f"Loaded {count} images")
+            for _, destination in file_pairs:
+                file_viewer.add_file(destination)
+    except Exception as e:
+        print(f"Error loading images: {e}")
+    return
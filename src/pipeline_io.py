@@ -0,0 +1,39 @@
+from json import loads, dumps
+from typing import Dict, Any
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def load_pipeline_file(filepath) -> Dict[str, Any]:
+    """
+    Load a pipeline JSON file, using orjson when it is installed
+
+    Args:
+        filepath: Path of the pipeline file
+
+    Returns:
+        Dictionary with the pipeline data
+    """
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return loads(content)
+
+def save_pipeline_file(filepath, pipeline_data: Dict[str, Any]) -> None:
+    """
+    Save pipeline data as indented JSON, using orjson when it is installed
+
+    Args:
+        filepath: Path of the pipeline file
+        pipeline_data: JSON-serializable pipeline dictionary
+    """
+    if ORJSON_AVAILABLE:
+        content = orjson.dumps(pipeline_data, option=orjson.OPT_INDENT_2)
+    else:
+        content = dumps(pipeline_data, indent=2).encode('utf-8')
+    with open(filepath, 'wb') as f:
+        f.write(content)
+    return
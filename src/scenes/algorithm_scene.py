@@ -1,8 +1,9 @@
 from pygame import VIDEORESIZE, MOUSEBUTTONUP, Rect, draw, font
 from pathlib import Path
-from json import load, dump
-from tkinter import Tk, filedialog
+from json import load
 from traceback import print_exc
+from pipeline_io import load_pipeline_file, save_pipeline_file
+from windows.base_window import get_tk_root
 from windows.node_library import TabbedNodeViewer
 from windows.parameter_panel import ParameterPanel
 from windows.node_canvas import NodeCanvas, CanvasNode
@@ -77,14 +78,15 @@ class AlgorithmScene:
             node_hover_color=(120, 170, 220),
             text_color=(255, 255, 255)
         )
-        for category in self.node_definitions.get('categories', []):
-            category_name = category.get('name', 'Unknown')
-            self.node_viewer.add_category(category_name)
-            for node in category.get('nodes', []):
-                node_name = node.get('name', 'Unnamed')
-                description = node.get('description', '')
-                color = tuple(node.get('color', [100, 150, 200]))
-                self.node_viewer.add_node(node_name, category_name, description, color)
+        with self.node_viewer.batch_add():
+            for category in self.node_definitions.get('categories', []):
+                category_name = category.get('name', 'Unknown')
+                self.node_viewer.add_category(category_name)
+                for node in category.get('nodes', []):
+                    node_name = node.get('name', 'Unnamed')
+                    description = node.get('description', '')
+                    color = tuple(node.get('color', [100, 150, 200]))
+                    self.node_viewer.add_node(node_name, category_name, description, color)
         return
     
     def setup_algorithm_viewer(self):
@@ -98,14 +100,15 @@ class AlgorithmScene:
             node_hover_color=(170, 120, 220),
             text_color=(255, 255, 255)
         )
-        for category in self.algorithm_definitions.get('categories', []):
-            category_name = category.get('name', 'Unknown')
-            self.algorithm_viewer.add_category(category_name)
-            for algorithm in category.get('algorithms', []):
-                algorithm_name = algorithm.get('name', 'Unnamed')
-                description = algorithm.get('description', '')
-                color = tuple(algorithm.get('color', [150, 100, 200]))
-                self.algorithm_viewer.add_node(algorithm_name, category_name, description, color)
+        with self.algorithm_viewer.batch_add():
+            for category in self.algorithm_definitions.get('categories', []):
+                category_name = category.get('name', 'Unknown')
+                self.algorithm_viewer.add_category(category_name)
+                for algorithm in category.get('algorithms', []):
+                    algorithm_name = algorithm.get('name', 'Unnamed')
+                    description = algorithm.get('description', '')
+                    color = tuple(algorithm.get('color', [150, 100, 200]))
+                    self.algorithm_viewer.add_node(algorithm_name, category_name, description, color)
         return
     
     def setup_canvas(self):
@@ -354,8 +357,7 @@ class AlgorithmScene:
             algorithms = []
             for pipeline_file in pipeline_files:
                 try:
-                    with open(pipeline_file, 'r') as f:
-                        pipeline_data = load(f)
+                    pipeline_data = load_pipeline_file(pipeline_file)
                     algorithm = {
                         "name": pipeline_file.stem,
                         "description": f"Saved pipeline: {pipeline_file.name}",
@@ -382,19 +384,18 @@ class AlgorithmScene:
     def _load_pipeline(self):
         """Load a pipeline from JSON file"""
         try:
-            root = Tk()
-            root.withdraw()
+            from tkinter import filedialog
+            root = get_tk_root()
             initial_dir = str(self.working_dir) if self.working_dir.exists() else None
             filepath = filedialog.askopenfilename(
                 title="Load Pipeline",
                 filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
                 initialdir=initial_dir
             )
-            root.destroy()
+            root.update()
             if not filepath:
                 return
-            with open(filepath, 'r') as f:
-                pipeline_data = load(f)
+            pipeline_data = load_pipeline_file(filepath)
             self._deserialize_pipeline(pipeline_data)
             print(f"Pipeline loaded from: {filepath}")
         except Exception as e:
@@ -405,8 +406,8 @@ class AlgorithmScene:
     def _save_pipeline(self):
         """Save the current pipeline to JSON file"""
         try:
-            root = Tk()
-            root.withdraw()
+            from tkinter import filedialog
+            root = get_tk_root()
             initial_dir = str(self.working_dir) if self.working_dir.exists() else None
             filepath = filedialog.asksaveasfilename(
                 title="Save Pipeline",
@@ -414,24 +415,24 @@ class AlgorithmScene:
                 filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
                 initialdir=initial_dir
             )
-            root.destroy()
+            root.update()
             if not filepath:
                 return
             pipeline_data = self._serialize_pipeline()
-            with open(filepath, 'w') as f:
-                dump(pipeline_data, f, indent=2)
+            save_pipeline_file(filepath, pipeline_data)
             print(f"Pipeline saved to: {filepath}")
             self.algorithm_definitions = self._load_algorithm_definitions()
             self.algorithm_viewer.categories.clear()
             self.algorithm_viewer.nodes.clear()
-            for category in self.algorithm_definitions.get('categories', []):
-                category_name = category.get('name', 'Unknown')
-                self.algorithm_viewer.add_category(category_name)
-                for algorithm in category.get('algorithms', []):
-                    algorithm_name = algorithm.get('name', 'Unnamed')
-                    description = algorithm.get('description', '')
-                    color = tuple(algorithm.get('color', [150, 100, 200]))
-                    self.algorithm_viewer.add_node(algorithm_name, category_name, description, color)
+            with self.algorithm_viewer.batch_add():
+                for category in self.algorithm_definitions.get('categories', []):
+                    category_name = category.get('name', 'Unknown')
+                    self.algorithm_viewer.add_category(category_name)
+                    for algorithm in category.get('algorithms', []):
+                        algorithm_name = algorithm.get('name', 'Unnamed')
+                        description = algorithm.get('description', '')
+                        color = tuple(algorithm.get('color', [150, 100, 200]))
+                        self.algorithm_viewer.add_node(algorithm_name, category_name, description, color)
         except Exception as e:
             print(f"Error saving pipeline: {e}")
             print_exc()
@@ -509,20 +510,9 @@ class AlgorithmScene:
         for node_data in pipeline_data.get("nodes", []):
             if node_data.get("node_type") == "algorithm":
                 pipeline_data_embedded = node_data.get("pipeline_data", {})
-                input_params = []
-                for conn in pipeline_data_embedded.get("connections", []):
-                    from_node_data = next((n for n in pipeline_data_embedded.get("nodes", []) 
-                                         if n['id'] == conn['from_node']), None)
-                    if from_node_data and from_node_data.get("node_type") == "input":
-                        param_name = conn.get("to_parameter")
-                        if param_name and param_name not in [p["name"] for p in input_params]:
-                            input_params.append({
-                                'name': param_name,
-                                'type': 'image',
-                                'connectable': True
-                            })
-                if not input_params:
-                    input_params.append({'name': 'image', 'type': 'image', 'connectable': True})
+                embedded_nodes_by_id = {n['id']: n for n in pipeline_data_embedded.get("nodes", [])}
+                input_params = self.canvas._extract_algorithm_inputs(pipeline_data_embedded, 
+                                                                     embedded_nodes_by_id)
                 new_node = CanvasNode(
                     node_data["name"],
                     node_data["category"],
@@ -539,7 +529,7 @@ class AlgorithmScene:
                 self.canvas.nodes.append(new_node)
                 node_map[node_data["id"]] = new_node
             elif node_data.get("node_type") == "process":
-                param_info = self._get_parameter_info(node_data["name"])
+                param_info = self.canvas.get_parameter_info(node_data["name"])
                 new_node = CanvasNode(
                     node_data["name"],
                     node_data["category"],
@@ -564,4 +554,5 @@ class AlgorithmScene:
                     print(f"Warning: Could not find from_node for connection: {conn_data['from_node']}")
                 if not to_node:
                     print(f"Warning: Could not find to_node for connection: {conn_data['to_node']}")
+        self.canvas.invalidate()
         return
\ No newline at end of file
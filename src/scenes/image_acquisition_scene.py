@@ -1,8 +1,9 @@
 from pygame import VIDEORESIZE, surfarray, image, KEYDOWN, K_ESCAPE
 from pathlib import Path
-from shutil import rmtree, copy2
+from shutil import rmtree
+from os import scandir, path
 from datetime import datetime
-from tkinter import Tk, filedialog
+from image_io import copy_files, load_images_into
 from windows.file_viewer import FileViewer
 from windows.menu_bar import MenuBar
 from windows.camera_view import CameraView
@@ -243,7 +244,7 @@ class ImageAcquisitionScene:
             filepath = self.working_dir / filename
             image.save(self.live_frame, str(filepath))
             print(f"Image captured: {filepath}")
-            self.file_viewer.load_directory(str(self.working_dir))
+            self.file_viewer.add_file(filepath)
         except Exception as e:
             print(f"Error capturing image: {e}")
         return
@@ -280,40 +281,18 @@ class ImageAcquisitionScene:
     
     def _load_images(self):
         """Load images from file system into working directory"""
-        try:
-            root = Tk()
-            root.withdraw()
-            initial_dir = str(self.working_dir) if self.working_dir.exists() else None
-            filepaths = filedialog.askopenfilenames(
-                title="Select Images to Load",
-                filetypes=[
-                    ("Image files", "*.png *.jpg *.jpeg *.bmp *.gif *.tiff *.webp"),
-                    ("All files", "*.*")
-                ],
-                initialdir=initial_dir
-            )
-            root.destroy()
-            if not filepaths:
-                return
-            if not self.working_dir.exists():
-                self.working_dir.mkdir(parents=True)
-            count = 0
-            for filepath in filepaths:
-                source_file = Path(filepath)
-                destination = self.working_dir / source_file.name
-                copy2(source_file, destination)
-                count += 1
-            if count > 0:
-                print(f"Loaded {count} images")
-                self.file_viewer.load_directory(str(self.working_dir))
-        except Exception as e:
-            print(f"Error loading images: {e}")
+        load_images_into(self.working_dir, self.file_viewer)
         return
     
     def _save_images(self):
         """Save images from working directory to settings save path"""
         try:
-            if not self.working_dir.exists() or not any(self.working_dir.iterdir()):
+            if not self.working_dir.exists():
+                print("No images to save")
+                return
+            with scandir(self.working_dir) as directory_entries:
+                entries = [entry for entry in directory_entries if entry.is_file()]
+            if not entries:
                 print("No images to save")
                 return
             save_path = Path(self.settings.saved_settings["processing"]["save_path"])
@@ -323,12 +302,11 @@ class ImageAcquisitionScene:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             save_dir = save_path / f"images_{timestamp}"
             save_dir.mkdir(exist_ok=True)
-            count = 0
-            for file in self.working_dir.iterdir():
-                if file.is_file() and file.suffix.lower() in self.file_viewer.IMAGE_EXTENSIONS:
-                    destination = save_dir / file.name
-                    copy2(file, destination)
-                    count += 1
+            file_pairs = []
+            for entry in entries:
+                if path.splitext(entry.name)[1].lower() in self.file_viewer.IMAGE_EXTENSIONS:
+                    file_pairs.append((entry.path, save_dir / entry.name))
+            count = copy_files(file_pairs)
             if count > 0:
                 print(f"Saved {count} images to: {save_dir}")
             else:
@@ -7,6 +7,8 @@ from enum import Enum
 import numpy as np
 from traceback import print_exc
 from camera import CameraThread
+from windows.base_window import get_tk_root
+from image_io import load_images_into
 from windows.file_viewer import FileViewer
 from windows.menu_bar import MenuBar
 from windows.node_canvas import NodeCanvas, CanvasNode, NodeType
@@ -14,6 +16,7 @@ from windows.processing_window import ProcessingViewport
 from windows.processing_panel import ProcessingControlPanel
 from windows.parameter_panel import ParameterPanel
 from pipeline_execution import PipelineExecutor
+from pipeline_io import load_pipeline_file
 from typing import List, Optional, Dict, Any
 
 class ViewMode(Enum):
@@ -99,7 +102,7 @@ class ProcessingScene:
             rel_pos=(0.0, 0.0),
             rel_size=(1.0, 0.05),
             switch_scene_callback=self.switch_scene_callback,
-            call_methods=[self._save_output],
+            call_methods=[self._load_images, self._save_output],
             reference_resolution=self.settings.saved_settings["display"]["resolution"]
         )
         return
@@ -338,8 +341,7 @@ class ProcessingScene:
         if not self.selected_pipeline:
             return
         try:
-            with open(self.selected_pipeline, 'r') as f:
-                pipeline_data = load(f)
+            pipeline_data = load_pipeline_file(self.selected_pipeline)
             self.pipeline_executor = PipelineExecutor(pipeline_data)
             node_definitions = self._load_node_definitions()
             canvas = self._create_pipeline_canvas(node_definitions)
@@ -404,6 +406,7 @@ class ProcessingScene:
         self._map_io_nodes(pipeline_data, canvas, node_map)
         self._create_process_nodes(pipeline_data, canvas, node_map)
         self._create_connections(pipeline_data, canvas, node_map)
+        canvas.invalidate()
         return
     
     def _map_io_nodes(self, pipeline_data: Dict[str, Any], 
@@ -630,15 +633,19 @@ class ProcessingScene:
             print_exc()
         return
     
+    def _load_images(self):
+        """Load images from file system into working directory (menu callback)"""
+        load_images_into(self.working_dir, self.file_viewer)
+        return
+    
     def _save_output(self):
         """Save processed output (menu callback)"""
         if not self.output_image:
             print("No output to save")
             return
         try:
-            from tkinter import Tk, filedialog
-            root = Tk()
-            root.withdraw()
+            from tkinter import filedialog
+            root = get_tk_root()
             filepath = filedialog.asksaveasfilename(
                 title="Save Output Image",
                 defaultextension=".png",
@@ -649,13 +656,14 @@ class ProcessingScene:
                 ],
                 initialdir=str(self.output_dir) if self.output_dir.exists() else None
             )
-            root.destroy()
+            root.update()
             if not filepath:
                 return
-            image.save(self.output_image, filepath)
-            print(f"Output saved to: {filepath}")
+            output_path = Path(filepath)
+            image.save(self.output_image, str(output_path))
+            print(f"Output saved to: {output_path}")
             if self.output_data:
-                metadata_path = Path(filepath).with_suffix('.json')
+                metadata_path = output_path.with_suffix('.json')
                 with open(metadata_path, 'w') as f:
                     dump({
                         "processing_date": datetime.now().isoformat(),
@@ -33,11 +33,11 @@ class Statemachine:
         working_directory = self.directories[0]
         pipeline_directory = self.directories[1]
         output_directory = self.directories[2]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if not (working_directory and path.exists(working_directory)):
             base_dir = "temp_working_dirs"
             makedirs(base_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             working_directory = Path(base_dir) / f"working_dir_{timestamp}"
             working_directory.mkdir(exist_ok=True)
             print(f"Created new working directory: {working_directory}")
@@ -45,7 +45,6 @@ class Statemachine:
         if not (pipeline_directory and path.exists(pipeline_directory)):
             base_dir = "pipeline_dirs"
             makedirs(base_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             pipeline_directory = Path(base_dir) / f"pipeline_dir_{timestamp}"
             pipeline_directory.mkdir(exist_ok=True)
             print(f"Created new pipeline directory: {pipeline_directory}")
@@ -53,7 +52,6 @@ class Statemachine:
         if not (output_directory and path.exists(output_directory)):
             base_dir = "output_dirs"
             makedirs(base_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_directory = Path(base_dir) / f"output_dir_{timestamp}"
             output_directory.mkdir(exist_ok=True)
             print(f"Created new output directory: {output_directory}")
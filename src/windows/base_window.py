@@ -1,6 +1,23 @@
 from abc import ABC,abstractmethod
 from pygame import Rect,font,VIDEORESIZE
 
+_TK_ROOT = None
+
+def get_tk_root():
+    """
+    Get the shared hidden Tk root used as parent for file and input dialogs.
+    The root is created on first use and kept alive afterwards.
+
+    Returns:
+        Withdrawn Tk root instance
+    """
+    global _TK_ROOT
+    if _TK_ROOT is None:
+        from tkinter import Tk
+        _TK_ROOT = Tk()
+        _TK_ROOT.withdraw()
+    return _TK_ROOT
+
 class BaseWindow(ABC):
     @abstractmethod
     def __init__(self,
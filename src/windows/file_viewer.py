@@ -3,8 +3,7 @@ from pygame import (Rect, draw, mouse, MOUSEBUTTONDOWN, MOUSEWHEEL, K_DELETE, KE
 from pathlib import Path
 from datetime import datetime
 from shutil import copy2, move, rmtree
-from windows.base_window import BaseWindow
-from tkinter import Tk, simpledialog
+from windows.base_window import BaseWindow, get_tk_root
 from typing import Tuple, List, Optional
 
 class FileItem:
@@ -365,6 +364,32 @@ class FileViewer(BaseWindow):
         self.max_scroll = max(0, total_height - self.rect.height)
         return
     
+    def add_file(self, path) -> None:
+        """
+        Add a single new file of the loaded directory without rescanning it
+        
+        Args:
+            path: Path of the file that was created in the root directory
+        """
+        file_path = Path(path)
+        if self.root_path is None or file_path.parent != self.root_path:
+            return
+        if file_path.suffix.lower() not in self.IMAGE_EXTENSIONS:
+            return
+        sort_name = file_path.name.lower()
+        insert_index = len(self.items)
+        for i, item in enumerate(self.items):
+            if item.depth != 0 or item.is_folder:
+                continue
+            if item.path == file_path:
+                return
+            if item.name.lower() > sort_name:
+                insert_index = i
+                break
+        self.items.insert(insert_index, FileItem(file_path, is_folder=False, depth=0))
+        self._update_visible_items()
+        return
+    
     def expand_folder(self, folder_item: FileItem) -> None:
         """
         Expand a folder to show its contents
@@ -548,10 +573,10 @@ class FileViewer(BaseWindow):
         Returns:
             New name or None if cancelled
         """
-        root = Tk()
-        root.withdraw()
+        from tkinter import simpledialog
+        root = get_tk_root()
         new_name = simpledialog.askstring("Rename", "Enter new name:", initialvalue=current_name)
-        root.destroy()
+        root.update()
         return new_name
     
     def _get_user_input_for_new_folder(self) -> Optional[str]:
@@ -561,8 +586,8 @@ class FileViewer(BaseWindow):
         Returns:
             Folder name or None if cancelled
         """
-        root = Tk()
-        root.withdraw()
+        from tkinter import simpledialog
+        root = get_tk_root()
         folder_name = simpledialog.askstring("New Folder", "Enter folder name:")
-        root.destroy()
+        root.update()
         return folder_name
\ No newline at end of file
@@ -1,3 +1,4 @@
+from pygame import MOUSEBUTTONDOWN, MOUSEBUTTONUP, VIDEORESIZE
 from windows.base_window import BaseWindow
 from UI.button import Button
 '''
@@ -10,9 +11,28 @@ from pygame import image
 from datetime import datetime
 from traceback import print_exc
 '''
+from functools import partial
 from typing import Tuple
 
 class MenuBar(BaseWindow):
+    # Event types the menu buttons react to
+    BUTTON_EVENT_TYPES = frozenset((MOUSEBUTTONDOWN, MOUSEBUTTONUP, VIDEORESIZE))
+    # Scene specific buttons as (label, action), an int action indexes call_methods,
+    # a str action is the scene to switch to
+    SCENE_ACTIONS = {
+        "settings": (("Save Settings", 0), ("Close Application", "quit")),
+        "image_acquisition": (("Load Images", 0), ("Save Images", 1)),
+        "algorithms": (("Load Pipeline", 0), ("Save Pipeline", 1)),
+        "processing": (("Load Images", 0), ("Save Output", 1))
+    }
+    # Index of the scene switch button that represents each scene
+    SCENE_DISABLE_INDEX = {
+        "settings": 0,
+        "image_acquisition": 1,
+        "algorithms": 2,
+        "processing": 3
+    }
+
     def __init__(
             self,
             scene_instance=None,
@@ -58,48 +78,36 @@ class MenuBar(BaseWindow):
 
     def handle_events(self,events:list)->None:
         self.handle_resize_events(events)
-        for button in self.menu_buttons:
-            button.handle_events(events)
+        button_events = [event for event in events if event.type in self.BUTTON_EVENT_TYPES]
+        if not button_events:
+            return
+        for handle_button_events in self._event_fns:
+            handle_button_events(button_events)
         return
 
     def update(self)->None:
         pass
 
     def draw(self,screen)->None:
-        for button in self.menu_buttons:
-            button.draw(screen)
+        for draw_button in self._draw_fns:
+            draw_button(screen)
         return
     
     def _setup_buttons(self)->None:
         self.button_labels = ["Settings", "Image Acquisition", "Algorithms", "Processing"]
         self.callbacks = [
-            lambda: self.switch_scene("settings"),
-            lambda: self.switch_scene("image_acquisition"),
-            lambda: self.switch_scene("algorithms"),
-            lambda: self.switch_scene("processing")
+            partial(self.switch_scene, "settings"),
+            partial(self.switch_scene, "image_acquisition"),
+            partial(self.switch_scene, "algorithms"),
+            partial(self.switch_scene, "processing")
         ]
-        #When methodes are moved, change callbacks
-        if self.scene == "settings":
-            self.button_labels.append("Save Settings")
-            self.button_labels.append("Close Application")
-            self.callbacks.append(lambda: self.call_methods[0]())
-            self.callbacks.append(lambda: self.switch_scene("quit"))
-        elif self.scene == "image_acquisition":
-            self.button_labels.append("Load Images")
-            self.button_labels.append("Save Images")
-            self.callbacks.append(lambda: self.call_methods[0]())
-            self.callbacks.append(lambda: self.call_methods[1]())
-        elif self.scene == "algorithms":
-            self.button_labels.append("Load Pipeline")
-            self.button_labels.append("Save Pipeline")
-            self.callbacks.append(lambda: self.call_methods[0]())
-            self.callbacks.append(lambda: self.call_methods[1]())
-        elif self.scene == "processing":
-            self.button_labels.append("Load Images")
-            self.button_labels.append("Save Output")
-            self.callbacks.append(lambda: self.call_methods[0]())
-            self.callbacks.append(lambda: self.call_methods[1]())
-        self.menu_buttons = []
+        #When methodes are moved, change SCENE_ACTIONS
+        for label, action in self.SCENE_ACTIONS.get(self.scene, ()):
+            self.button_labels.append(label)
+            if isinstance(action, int):
+                self.callbacks.append(self._get_call_method(action))
+            else:
+                self.callbacks.append(partial(self.switch_scene, action))
         layouts = self._positions(
             rows=1,
             cols=len(self.button_labels),
@@ -107,9 +115,12 @@ class MenuBar(BaseWindow):
             rel_size=self.rel_size,
             gap=0.001
         )
-        for i in range(len(self.button_labels)):
+        #Deactivate the Button that the current Scene represents
+        disabled_index = self.SCENE_DISABLE_INDEX.get(self.scene)
+        self.menu_buttons = []
+        for i, label in enumerate(self.button_labels):
             button = Button(
-                text=self.button_labels[i],
+                text=label,
                 rel_pos=layouts[i][0],
                 rel_size=layouts[i][1],
                 s_font=self.s_font,
@@ -123,20 +134,31 @@ class MenuBar(BaseWindow):
                 disabled_text_color=self.disabled_text_color,
                 border_radius=self.border_radius,
                 text_padding=self.text_padding,
+                enabled=i != disabled_index,
                 reference_resolution=self.reference_resolution
             )
             self.menu_buttons.append(button)
-        #Deactivate the Button that the current Scene represents
-        if self.scene == "settings":
-            self.menu_buttons[0].set_enabled(False)
-        elif self.scene == "image_acquisition":
-            self.menu_buttons[1].set_enabled(False)
-        elif self.scene == "algorithms":
-            self.menu_buttons[2].set_enabled(False)
-        elif self.scene == "processing":
-            self.menu_buttons[3].set_enabled(False)
+        #Bound methods for the per frame loops
+        self._event_fns = [button.handle_events for button in self.menu_buttons]
+        self._draw_fns = [button.draw for button in self.menu_buttons]
         return
 
+    def _get_call_method(self,index:int):
+        """
+        Get the scene method for a menu button without wrapping it,
+        a missing method raises IndexError while the buttons are set up
+        
+        Args:
+            index: Index into call_methods
+            
+        Returns:
+            The bound scene method
+        """
+        if index >= len(self.call_methods):
+            raise IndexError(f"Scene '{self.scene}' provides {len(self.call_methods)} menu methods, "
+                             f"button needs index {index}")
+        return self.call_methods[index]
+
     def switch_scene(self,call:str)->None:
         """Switch to a different scene"""
         self.switch_scene_callback(call)
@@ -1,8 +1,99 @@
-from pygame import Rect, draw, font, mouse, MOUSEWHEEL, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION, K_DELETE, KEYDOWN
-from uuid import uuid4
+from pygame import Rect, Surface, SRCALPHA, draw, font, MOUSEWHEEL, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION, K_DELETE, KEYDOWN
+from itertools import count
 from windows.base_window import BaseWindow
-from typing import Tuple, List, Optional, Dict, Any
+from typing import Tuple, List, Optional, Dict, Any, Set
 from enum import Enum
+from math import ceil, floor
+from collections import OrderedDict
+from numpy import absolute, array, clip, einsum, empty, flatnonzero, float32, float64, inf, int32, linspace, stack
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _sample_bezier_curves_numpy(control_points, basis):
+    """
+    Sample a batch of cubic bezier curves with NumPy
+    
+    Args:
+        control_points: Array of shape (curves, 4, 2)
+        basis: Bernstein weights of shape (samples, 4)
+        
+    Returns:
+        int32 array of shape (curves, samples, 2)
+    """
+    return einsum('sk,nkd->nsd', basis, control_points).astype(int32)
+
+
+# Below this many curves the thread start-up of the parallel kernel costs
+# more than the einsum it replaces
+NUMBA_MIN_CURVES = 50
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _sample_bezier_curves_numba(control_points, basis):
+        """Numba kernel with the same contract as _sample_bezier_curves_numpy"""
+        curve_count = control_points.shape[0]
+        sample_count = basis.shape[0]
+        out = empty((curve_count, sample_count, 2), dtype=int32)
+        for k in prange(curve_count):
+            for s in range(sample_count):
+                x = 0.0
+                y = 0.0
+                for j in range(4):
+                    x += basis[s, j] * control_points[k, j, 0]
+                    y += basis[s, j] * control_points[k, j, 1]
+                out[k, s, 0] = int(x)
+                out[k, s, 1] = int(y)
+        return out
+
+
+def _sample_bezier_curves(control_points, basis):
+    """
+    Sample a batch of cubic bezier curves, using Numba for large batches
+    
+    Args:
+        control_points: Array of shape (curves, 4, 2)
+        basis: Bernstein weights of shape (samples, 4)
+        
+    Returns:
+        int32 array of shape (curves, samples, 2)
+    """
+    if NUMBA_AVAILABLE and control_points.shape[0] >= NUMBA_MIN_CURVES:
+        return _sample_bezier_curves_numba(control_points, basis)
+    return _sample_bezier_curves_numpy(control_points, basis)
+
+
+# Bernstein weights depend only on the segment count, so every canvas shares them
+_bezier_basis_cache = {}
+
+
+def _get_bezier_basis(segments: int):
+    """
+    Get the cubic Bernstein weights for evenly spaced curve samples
+    
+    Args:
+        segments: Number of line segments per curve
+        
+    Returns:
+        Read-only array of shape (segments + 1, 4)
+    """
+    basis = _bezier_basis_cache.get(segments)
+    if basis is None:
+        t = linspace(0.0, 1.0, segments + 1)
+        u = 1.0 - t
+        basis = stack([u ** 3, 3 * u ** 2 * t, 3 * u * t ** 2, t ** 3], axis=1)
+        basis.flags.writeable = False
+        _bezier_basis_cache[segments] = basis
+    return basis
+
+
+# Canvas object ids only need to be unique within the running application;
+# saved pipelines remap them to their own sequential ids
+_id_counter = count()
+
 
 class NodeType(Enum):
     """Enumeration of node types"""
@@ -21,26 +112,34 @@ class ConnectionPoint:
         position: (x, y) position in canvas coordinates
         is_input: True if this is an input point, False for output
     """
+    __slots__ = ('name', 'position', 'is_input')
+    
     def __init__(self, name: str, position: Tuple[float, float], is_input: bool = True):
         self.name = name
         self.position = position
         self.is_input = is_input
         return
     
-    def is_near(self, pos: Tuple[float, float], threshold: float = 15.0) -> bool:
+    def is_near(self, pos: Tuple[float, float], threshold: float = 15.0, 
+                threshold_sq: float = 225.0) -> bool:
         """
         Check if a position is near this connection point
         
         Args:
             pos: Position to check (x, y)
             threshold: Distance threshold in pixels
+            threshold_sq: Precomputed square of threshold
             
         Returns:
             True if position is within threshold distance
         """
         dx = pos[0] - self.position[0]
+        if not -threshold < dx < threshold:
+            return False
         dy = pos[1] - self.position[1]
-        return (dx * dx + dy * dy) < threshold * threshold
+        if not -threshold < dy < threshold:
+            return False
+        return (dx * dx + dy * dy) < threshold_sq
 
 
 class CanvasNode:
@@ -50,6 +149,11 @@ class CanvasNode:
     A node can be an input source, output destination, processing step,
     or an algorithm (encapsulated pipeline).
     """
+    __slots__ = ('id', 'name', 'category', 'color', 'parameters', 'parameter_info',
+                 'node_type', '_connectable_names', 'rect', 'header_height',
+                 'input_points', 'output_points', 'selected', 'dragging', 'drag_offset',
+                 'pipeline_data', 'algorithm_outputs', '_in_conns', '_out_conns',
+                 '_cached_surf', '_cached_key', '_cached_offset', '_label_surfaces', '_label_size')
     
     # Visual constants
     BASE_WIDTH = 150
@@ -58,10 +162,15 @@ class CanvasNode:
     PARAM_SPACING = 20
     OUTPUT_SPACING = 20
     CONNECTION_POINT_THRESHOLD = 15
+    CONNECTION_POINT_THRESHOLD_SQ = CONNECTION_POINT_THRESHOLD * CONNECTION_POINT_THRESHOLD
     
     # Colors
     HEADER_DARKEN_AMOUNT = 30
     
+    # Bumped whenever connection points are rebuilt through the public API,
+    # so canvases can tell that node geometry was changed from outside
+    geometry_epoch = 0
+    
     def __init__(self, 
                  name: str, 
                  category: str, 
@@ -84,24 +193,32 @@ class CanvasNode:
             parameter_info: List of parameter definitions
             node_type: Type of node ("input", "output", "process", "algorithm")
         """
-        self.id = str(uuid4())
+        self.id = f"n{next(_id_counter)}"
         self.name = name
         self.category = category
         self.color = color
         self.parameters = parameters or {}
         self.parameter_info = parameter_info or []
         self.node_type = NodeType(node_type)
+        self._connectable_names: Tuple[str, ...] = tuple(
+            p['name'] for p in self.parameter_info if p.get('connectable', False))
         self.rect = self._calculate_rect(x, y)
         self.header_height = self.HEADER_HEIGHT
         self.input_points: Dict[str, ConnectionPoint] = {}
         self.output_points: Dict[str, ConnectionPoint] = {}
+        self.pipeline_data: Optional[Dict[str, Any]] = None
+        self.algorithm_outputs: List[str] = ["image"]
         self._update_connection_points()
         self.selected = False
         self.dragging = False
         self.drag_offset = (0.0, 0.0)
-        if self.node_type == NodeType.ALGORITHM:
-            self.pipeline_data: Optional[Dict[str, Any]] = None
-            self.algorithm_outputs: List[str] = ["image"]
+        self._in_conns: Set["Connection"] = set()
+        self._out_conns: Set["Connection"] = set()
+        self._cached_surf: Optional[Surface] = None
+        self._cached_key: Optional[Tuple] = None
+        self._cached_offset = (0, 0)
+        self._label_surfaces: Dict[str, Surface] = {}
+        self._label_size = 0
         return
     
     def _calculate_rect(self, x: float, y: float) -> Rect:
@@ -115,15 +232,12 @@ class CanvasNode:
         Returns:
             Pygame Rect for the node
         """
-        connectable_params = [p for p in self.parameter_info if p.get('connectable', False)]
         if self.node_type == NodeType.OUTPUT:
             total_height = self.BASE_HEIGHT + self.PARAM_SPACING
         elif self.node_type == NodeType.INPUT:
             total_height = self.BASE_HEIGHT
-        elif self.node_type == NodeType.ALGORITHM:
-            total_height = self.BASE_HEIGHT + len(connectable_params) * self.PARAM_SPACING
         else:
-            total_height = self.BASE_HEIGHT + len(connectable_params) * self.PARAM_SPACING
+            total_height = self.BASE_HEIGHT + len(self._connectable_names) * self.PARAM_SPACING
         return Rect(x, y, self.BASE_WIDTH, total_height)
     
     def _update_connection_points(self) -> None:
@@ -159,14 +273,11 @@ class CanvasNode:
         y_offset = self.rect.top + self.header_height + 10
         self.input_points["image"] = ConnectionPoint("image", (self.rect.left, y_offset), is_input=True)
         y_offset += 30
-        connectable_params = [p for p in self.parameter_info if p.get('connectable', False)]
-        for param in connectable_params:
-            param_name = param['name']
-            self.input_points[param_name] = ConnectionPoint(param_name, (self.rect.left, y_offset), is_input=True)
-            y_offset += 25
+        left = self.rect.left
+        for i, param_name in enumerate(self._connectable_names):
+            self.input_points[param_name] = ConnectionPoint(param_name, (left, y_offset + 25 * i), is_input=True)
         y_offset = self.rect.top + self.header_height + 10
-        outputs = getattr(self, 'algorithm_outputs', ['image'])
-        for output_name in outputs:
+        for output_name in self.algorithm_outputs:
             self.output_points[output_name] = ConnectionPoint(output_name, (self.rect.right, y_offset), is_input=False)
             y_offset += 20
         return
@@ -181,16 +292,15 @@ class CanvasNode:
             self.output_points["data"] = ConnectionPoint("data", (self.rect.right, y_offset), is_input=False)
             y_offset += 20
         y_offset = self.rect.top + self.header_height + 30
-        connectable_params = [p for p in self.parameter_info if p.get('connectable', False)]
-        for param in connectable_params:
-            param_name = param['name']
-            self.input_points[param_name] = ConnectionPoint(param_name, (self.rect.left, y_offset), is_input=True)
-            y_offset += 25
+        left = self.rect.left
+        for i, param_name in enumerate(self._connectable_names):
+            self.input_points[param_name] = ConnectionPoint(param_name, (left, y_offset + 25 * i), is_input=True)
         return
     
     def update_connection_points(self) -> None:
         """Public method to update connection points (after move/resize)"""
         self._update_connection_points()
+        CanvasNode.geometry_epoch += 1
         return
     
     def contains_point(self, pos: Tuple[float, float]) -> bool:
@@ -205,6 +315,24 @@ class CanvasNode:
         """
         return self.rect.collidepoint(pos)
     
+    def is_near_bounds(self, pos: Tuple[float, float]) -> bool:
+        """
+        Check if a position is within the pick threshold of the node rect
+        
+        Every connection point sits on the node border, so positions failing
+        this test cannot be near any of them.
+        
+        Args:
+            pos: Position to check
+            
+        Returns:
+            True if position is inside the inflated node rect
+        """
+        threshold = self.CONNECTION_POINT_THRESHOLD
+        rect = self.rect
+        return (rect.left - threshold < pos[0] < rect.right + threshold
+                and rect.top - threshold < pos[1] < rect.bottom + threshold)
+    
     def get_input_at_position(self, pos: Tuple[float, float]) -> Optional[str]:
         """
         Get input connection point name at position
@@ -215,8 +343,10 @@ class CanvasNode:
         Returns:
             Input point name or None
         """
+        if not self.is_near_bounds(pos):
+            return None
         for name, point in self.input_points.items():
-            if point.is_near(pos, self.CONNECTION_POINT_THRESHOLD):
+            if point.is_near(pos, self.CONNECTION_POINT_THRESHOLD, self.CONNECTION_POINT_THRESHOLD_SQ):
                 return name
         return None
     
@@ -230,8 +360,10 @@ class CanvasNode:
         Returns:
             Output point name or None
         """
+        if not self.is_near_bounds(pos):
+            return None
         for name, point in self.output_points.items():
-            if point.is_near(pos, self.CONNECTION_POINT_THRESHOLD):
+            if point.is_near(pos, self.CONNECTION_POINT_THRESHOLD, self.CONNECTION_POINT_THRESHOLD_SQ):
                 return name
         return None
     
@@ -243,9 +375,26 @@ class CanvasNode:
             x: New X position
             y: New Y position
         """
+        old_x, old_y = self.rect.x, self.rect.y
         self.rect.x = x
         self.rect.y = y
-        self._update_connection_points()
+        self._translate_connection_points(self.rect.x - old_x, self.rect.y - old_y)
+        return
+    
+    def _translate_connection_points(self, dx: float, dy: float) -> None:
+        """
+        Shift all connection points by an offset without rebuilding them
+        
+        Args:
+            dx: Offset in X
+            dy: Offset in Y
+        """
+        if not dx and not dy:
+            return
+        for point in self.input_points.values():
+            point.position = (point.position[0] + dx, point.position[1] + dy)
+        for point in self.output_points.values():
+            point.position = (point.position[0] + dx, point.position[1] + dy)
         return
 
 
@@ -256,6 +405,9 @@ class Connection:
     Connections can be from any output point to any input point,
     allowing flexible data flow between nodes.
     """
+    __slots__ = ('id', 'from_node', 'to_node', 'to_parameter', 'from_output', 'color', 'selected',
+                 '_cached_key', '_cached_pts')
+    
     def __init__(self, 
                  from_node: CanvasNode, 
                  to_node: CanvasNode, 
@@ -270,13 +422,15 @@ class Connection:
             to_parameter: Name of input parameter (None for main input)
             from_output: Name of output to connect from
         """
-        self.id = str(uuid4())
+        self.id = f"c{next(_id_counter)}"
         self.from_node = from_node
         self.to_node = to_node
         self.to_parameter = to_parameter or "image"
         self.from_output = from_output
         self.color = (150, 150, 150)
         self.selected = False
+        self._cached_key: Optional[Tuple[float, float, float, float]] = None
+        self._cached_pts: Optional[List[List[int]]] = None
         return
     
     def get_start_position(self) -> Optional[Tuple[float, float]]:
@@ -290,6 +444,31 @@ class Connection:
         return input_point.position if input_point else None
 
 
+class NodeDefinition:
+    """
+    Read-only view of one node entry from the node definitions JSON
+    
+    Attributes:
+        name: Node type name
+        category: Name of the category the node is listed under
+        parameter_info: List of parameter definitions
+        default_parameters: Parameter name to default value, or None if a
+            parameter has no default value
+    """
+    __slots__ = ('name', 'category', 'parameter_info', 'default_parameters')
+    
+    def __init__(self, name: str, category: str, parameter_info: List[Dict[str, Any]]):
+        self.name = name
+        self.category = category
+        self.parameter_info = parameter_info
+        if all('value' in param for param in parameter_info):
+            self.default_parameters: Optional[Dict[str, Any]] = {
+                param['name']: param['value'] for param in parameter_info}
+        else:
+            self.default_parameters = None
+        return
+
+
 class NodeCanvas(BaseWindow):
     """
     Visual programming canvas for connecting nodes
@@ -320,6 +499,9 @@ class NodeCanvas(BaseWindow):
     # Connection rendering
     CONNECTION_WIDTH = 3
     CONNECTION_BEZIER_SEGMENTS = 20
+    CONNECTION_MIN_SEGMENTS = 4
+    CONNECTION_PIXELS_PER_SEGMENT = 8
+    CONNECTION_MIN_CURVE_LENGTH = 3
     CONNECTION_CONTROL_OFFSET_MIN = 50
     CONNECTION_CONTROL_OFFSET_MAX = 200
     CONNECTION_CONTROL_FACTOR = 0.5
@@ -330,12 +512,16 @@ class NodeCanvas(BaseWindow):
     CONNECTION_POINT_LABEL_OFFSET = 5
     
     # Text rendering
+    TEXT_CACHE_SIZE = 512
     CATEGORY_TEXT_Y_OFFSET = 15
     NAME_TEXT_Y_OFFSET = 8
     DESC_TEXT_Y_OFFSET = 4
     TINY_FONT_SIZE = 12
     MIN_SCALED_FONT = 6
     MIN_SCALED_TINY_FONT = 6
+    FONT_SIZE_STEP = 2
+    LABEL_MIN_ZOOM = 0.6
+    TEXT_MIN_ZOOM = 0.5
     
     # Colors
     GRID_COLOR = (50, 50, 50)
@@ -355,6 +541,10 @@ class NodeCanvas(BaseWindow):
     OUTPUT_NODE_COLOR = (180, 50, 50)
     OUTPUT_NODE_HEIGHT = 100
     
+    # Spatial index
+    SPATIAL_CELL_SHIFT = 7
+    SPATIAL_CELL_SIZE = 1 << SPATIAL_CELL_SHIFT
+    
     def __init__(self,
                  rel_pos: Tuple[float, float] = (0.251, 0.051),
                  rel_size: Tuple[float, float] = (0.498, 0.608),
@@ -389,8 +579,11 @@ class NodeCanvas(BaseWindow):
         self.base_small_font_size = 16
         self.small_font: Optional[font.Font] = None
         self.node_definitions = node_definitions or {"categories": []}
+        self._definitions: Optional[Dict[str, NodeDefinition]] = None
+        self._definitions_source: Optional[Dict[str, Any]] = None
         self.nodes: List[CanvasNode] = []
         self.connections: List[Connection] = []
+        self._connection_keys: Set[Tuple[str, str, str, str]] = set()
         self.selected_nodes: List[CanvasNode] = []
         self.dragging_node: Optional[CanvasNode] = None
         self.dragging_connection: Optional[CanvasNode] = None
@@ -400,8 +593,64 @@ class NodeCanvas(BaseWindow):
         self.is_panning = False
         self.pan_start: Optional[Tuple[int, int]] = None
         self.zoom = 1.0
+        self._update_transform_consts()
+        self._mouse_pos: Tuple[int, int] = (0, 0)
+        self._event_handlers = {
+            MOUSEWHEEL: self._dispatch_wheel,
+            MOUSEBUTTONDOWN: self._dispatch_mouse_down,
+            MOUSEBUTTONUP: self._dispatch_mouse_up,
+            MOUSEMOTION: self._dispatch_motion,
+            KEYDOWN: self._dispatch_keydown,
+        }
         self.grid_size = self.GRID_SIZE
         self.show_grid = True
+        self._grid: Dict[Tuple[int, int], List[CanvasNode]] = {}
+        self._node_cells: Dict[str, List[Tuple[int, int]]] = {}
+        self._node_bounds: Dict[str, Rect] = {}
+        self._node_z: Dict[str, int] = {}
+        self._next_z = 0
+        self._grid_dirty = True
+        self._grid_nodes: List[CanvasNode] = []
+        self._points_dirty = True
+        self._points_epoch = CanvasNode.geometry_epoch
+        self._points_node_count = 0
+        self._in_xy = empty((0, 2), dtype=float32)
+        self._in_owner = empty(0, dtype=int32)
+        self._in_names: List[str] = []
+        self._out_xy = empty((0, 2), dtype=float32)
+        self._out_owner = empty(0, dtype=int32)
+        self._out_names: List[str] = []
+        self._point_owner_nodes: List[CanvasNode] = []
+        self._point_slices: Dict[str, Tuple[int, int, int, int]] = {}
+        self._font_cache: Dict[int, font.Font] = {}
+        # Border width and whether the category line is shown, per node type
+        self._node_face_styles = {
+            NodeType.INPUT: (self.NODE_BORDER_WIDTH_SPECIAL, True),
+            NodeType.OUTPUT: (self.NODE_BORDER_WIDTH_SPECIAL, True),
+            NodeType.PROCESS: (self.NODE_BORDER_WIDTH_NORMAL, False),
+            NodeType.ALGORITHM: (self.NODE_BORDER_WIDTH_NORMAL, True),
+        }
+        self._text_cache: OrderedDict = OrderedDict()
+        self._grid_surface: Optional[Surface] = None
+        self._port_sprites: Dict[Tuple[Tuple[int, int, int], int], Surface] = {}
+        self._header_colors: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        # Reused by face drawing helpers that need a short-lived rect
+        self._scratch_rect = Rect(0, 0, 0, 0)
+        for color in (self.INPUT_NODE_COLOR, self.OUTPUT_NODE_COLOR):
+            self._darken_color(color)
+        self._dirty = True
+        self._render_cache: Optional[Surface] = None
+        self._render_state: Optional[Tuple] = None
+        self._grid_surface_key: Optional[Tuple] = None
+        self._frame_cache: Dict[str, Tuple[Rect, Dict[str, Tuple[float, float]], Dict[str, Tuple[float, float]]]] = {}
+        self._frame_origin: Tuple[int, int] = (0, 0)
+        self._culled_nodes = 0
+        self._culled_connections = 0
+        self._frame_view = Rect(0, 0, 0, 0)
+        self._frame_offset: Tuple[float, float] = (0.0, 0.0)
+        self._scaled_font_size = self.MIN_SCALED_FONT
+        self._scaled_small_font_size = self.MIN_SCALED_TINY_FONT
+        self._scaled_tiny_font_size = self.MIN_SCALED_TINY_FONT
         self._add_default_nodes()
         return
     
@@ -415,7 +664,10 @@ class NodeCanvas(BaseWindow):
         super().update_layout(window_size)
         scale_factor = self.get_scale_factor()
         self.small_font_size = max(14, int(16 * scale_factor))
-        self.small_font = font.SysFont(None, self.small_font_size)
+        self.small_font = self._get_font(self.small_font_size)
+        self._text_cache.clear()
+        self._update_transform_consts()
+        self._dirty = True
         return
     
     def handle_events(self, events: list) -> None:
@@ -426,54 +678,160 @@ class NodeCanvas(BaseWindow):
             events: List of pygame events
         """
         self.handle_resize_events(events)
+        self._update_transform_consts()
+        handlers = self._event_handlers
+        pending_motion = None
         for event in events:
-            if event.type == MOUSEWHEEL:
-                if self.rect.collidepoint(mouse.get_pos()):
-                    self._handle_zoom(event)
-            elif event.type == MOUSEBUTTONDOWN:
-                if not self.rect.collidepoint(event.pos):
-                    continue
-                self._handle_mouse_down(event)
-            elif event.type == MOUSEBUTTONUP:
-                if event.button == 1:
-                    self._handle_left_mouse_up(event)
-                    self.is_panning = False
-                    self.pan_start = None
-                elif event.button == 3:
-                    self._handle_right_mouse_up(event)
-            elif event.type == MOUSEMOTION:
-                self._handle_mouse_motion(event)
-            elif event.type == KEYDOWN:
-                if event.key == K_DELETE:
-                    self._delete_selected_nodes()
+            if event.type == MOUSEMOTION:
+                pending_motion = event
+                continue
+            if pending_motion is not None:
+                self._dispatch_motion(pending_motion)
+                pending_motion = None
+            handler = handlers.get(event.type)
+            if handler is not None:
+                handler(event)
+        if pending_motion is not None:
+            self._dispatch_motion(pending_motion)
+        return
+    
+    def _dispatch_wheel(self, event) -> None:
+        """Zoom when the wheel is turned over the canvas"""
+        if self.rect.collidepoint(self._mouse_pos):
+            self._handle_zoom(event, self._mouse_pos)
+        return
+    
+    def _dispatch_mouse_down(self, event) -> None:
+        """Handle a mouse press inside the canvas"""
+        self._mouse_pos = event.pos
+        if self.rect.collidepoint(event.pos):
+            self._handle_mouse_down(event)
+        return
+    
+    def _dispatch_mouse_up(self, event) -> None:
+        """
+        Handle a mouse release (anywhere, to end drags and pans)
+        
+        Only releasing a dragged connection changes what is drawn here;
+        node and connection removals mark the canvas dirty themselves.
+        """
+        self._mouse_pos = event.pos
+        if self.dragging_connection is not None:
+            self._dirty = True
+        if event.button == 1:
+            self._handle_left_mouse_up(event)
+            self.is_panning = False
+            self.pan_start = None
+        elif event.button == 3:
+            self._handle_right_mouse_up(event)
+        return
+    
+    def _dispatch_motion(self, event) -> None:
+        """Track the cursor and update pans and drags"""
+        self._mouse_pos = event.pos
+        self._handle_mouse_motion(event)
+        return
+    
+    def _dispatch_keydown(self, event) -> None:
+        """Delete the selected nodes on the delete key"""
+        if event.key == K_DELETE:
+            self._delete_selected_nodes()
+            self._dirty = True
         return
     
     def update(self) -> None:
         """Update canvas state (called every frame)"""
         pass
     
+    def invalidate(self) -> None:
+        """
+        Mark the canvas contents as changed from outside the canvas
+        
+        Scenes that edit canvas.nodes, node rects, colors or the selection
+        directly call this so the render cache, the spatial index and the
+        connection point arrays are rebuilt on the next use.
+        """
+        self._dirty = True
+        self._grid_dirty = True
+        self._points_dirty = True
+        return
+    
     def draw(self, surface) -> None:
         """
         Draw the canvas and all its contents
         
+        The last frame is reused until the canvas is marked dirty, either by
+        its own handlers or by invalidate(). The node/connection counts and the
+        geometry epoch only serve as a fallback for unannounced edits.
+        
         Args:
             surface: Pygame surface to draw on
         """
-        draw.rect(surface, self.background_color, self.rect)
-        clip_rect = surface.get_clip()
-        surface.set_clip(self.rect)
+        render_state = (len(self.nodes), len(self.connections), 
+                        CanvasNode.geometry_epoch, tuple(self.rect))
+        if (not self._dirty and self._render_cache is not None 
+                and render_state == self._render_state):
+            surface.blit(self._render_cache, self.rect.topleft)
+            return
+        visible_rect = self.rect.clip(surface.get_rect())
+        if visible_rect.width == 0 or visible_rect.height == 0:
+            return
+        canvas_surface = surface.subsurface(visible_rect)
+        self._update_transform_consts()
+        self._set_frame_origin(visible_rect.topleft)
+        canvas_surface.fill(self.background_color)
+        self._update_scaled_fonts()
+        self._build_frame_cache()
         if self.show_grid:
-            self._draw_grid(surface)
-        for connection in self.connections:
-            self._draw_connection(surface, connection)
+            self._draw_grid(canvas_surface)
+        self._draw_connections(canvas_surface)
         if self.dragging_connection and self.temp_connection_pos:
-            self._draw_temp_connection(surface)
-        for node in self.nodes:
-            self._draw_node(surface, node)
-        draw.rect(surface, self.CANVAS_BORDER_COLOR, self.rect, 2)
-        surface.set_clip(clip_rect)
+            self._draw_temp_connection(canvas_surface)
+        visible_nodes = self._collect_visible_nodes()
+        face_styles = self._node_face_styles
+        for node, frame_entry in visible_nodes:
+            self._update_node_face(node, frame_entry[0].size, *face_styles[node.node_type])
+        node_blits = []
+        for node, (screen_rect, screen_inputs, screen_outputs) in visible_nodes:
+            offset_x, offset_y = node._cached_offset
+            node_blits.append((node._cached_surf, (screen_rect.x - offset_x, screen_rect.y - offset_y)))
+            self._draw_connection_points(node_blits, node, screen_inputs, screen_outputs)
+        canvas_surface.blits(node_blits, doreturn=False)
+        draw.rect(canvas_surface, self.CANVAS_BORDER_COLOR, self._frame_view, 2)
+        if visible_rect.size == self.rect.size:
+            self._render_cache = canvas_surface.copy()
+            self._render_state = render_state
+            self._dirty = False
         return
     
+    def _set_frame_origin(self, origin: Tuple[int, int]) -> None:
+        """
+        Set the screen position of the subsurface the current frame is drawn into
+        
+        All drawing coordinates of the frame are relative to this origin, so
+        the canvas rect offset is folded into the transform once per frame.
+        
+        Args:
+            origin: Top-left corner of the drawing subsurface in screen coordinates
+        """
+        self._frame_origin = origin
+        self._frame_view = self.rect.move(-origin[0], -origin[1])
+        self._frame_offset = (self._ts_x - origin[0], self._ts_y - origin[1])
+        return
+    
+    def _canvas_to_frame(self, canvas_pos: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        Convert canvas coordinates to coordinates on the drawing subsurface
+        
+        Args:
+            canvas_pos: Position in canvas coordinates
+            
+        Returns:
+            Position relative to the frame origin
+        """
+        return (canvas_pos[0] * self._ts_z + self._frame_offset[0],
+                canvas_pos[1] * self._ts_z + self._frame_offset[1])
+    
     def add_node_from_template(self, template: Any, screen_pos: Tuple[int, int]) -> Optional[CanvasNode]:
         """
         Add a node to the canvas from a template at screen position
@@ -486,10 +844,12 @@ class NodeCanvas(BaseWindow):
             Created CanvasNode or None if failed
         """
         canvas_pos = self.screen_to_canvas(screen_pos)
-        param_info = self._get_parameter_info(template.name)
-        parameters = {}
-        for param in param_info:
-            parameters[param['name']] = param['value']
+        definition = self._get_node_definition(template.name)
+        param_info = definition.parameter_info if definition else []
+        if definition and definition.default_parameters is not None:
+            parameters = definition.default_parameters.copy()
+        else:
+            parameters = {param['name']: param['value'] for param in param_info}
         new_node = CanvasNode(
             template.name,
             template.category,
@@ -501,6 +861,9 @@ class NodeCanvas(BaseWindow):
             node_type="process"
         )
         self.nodes.append(new_node)
+        self._grid_dirty = True
+        self._points_dirty = True
+        self._dirty = True
         print(f"Added node '{template.name}' to canvas at {canvas_pos}")
         return new_node
     
@@ -523,8 +886,9 @@ class NodeCanvas(BaseWindow):
         """
         canvas_pos = self.screen_to_canvas(screen_pos)
         pipeline_data = algorithm_data.get('pipeline_data', {})
-        input_params = self._extract_algorithm_inputs(pipeline_data)
-        output_params = self._extract_algorithm_outputs(pipeline_data)
+        nodes_by_id = {n['id']: n for n in pipeline_data.get('nodes', [])}
+        input_params = self._extract_algorithm_inputs(pipeline_data, nodes_by_id)
+        output_params = self._extract_algorithm_outputs(pipeline_data, nodes_by_id)
         new_node = CanvasNode(
             algorithm_name,
             "Algorithm",
@@ -539,6 +903,9 @@ class NodeCanvas(BaseWindow):
         new_node.algorithm_outputs = output_params
         new_node.update_connection_points()
         self.nodes.append(new_node)
+        self._grid_dirty = True
+        self._points_dirty = True
+        self._dirty = True
         print(f"Added algorithm node '{algorithm_name}' to canvas")
         return new_node
     
@@ -559,13 +926,10 @@ class NodeCanvas(BaseWindow):
         Returns:
             Created Connection or None if invalid
         """
-        for conn in self.connections:
-            if (conn.from_node == from_node and 
-                conn.to_node == to_node and 
-                conn.to_parameter == to_parameter and 
-                conn.from_output == from_output):
-                print("Connection already exists")
-                return None
+        key = (from_node.id, to_node.id, to_parameter or "image", from_output)
+        if key in self._connection_keys:
+            print("Connection already exists")
+            return None
         if from_node == to_node:
             print("Cannot connect node to itself")
             return None
@@ -578,6 +942,10 @@ class NodeCanvas(BaseWindow):
             return None
         connection = Connection(from_node, to_node, to_parameter, from_output)
         self.connections.append(connection)
+        self._connection_keys.add(key)
+        from_node._out_conns.add(connection)
+        to_node._in_conns.add(connection)
+        self._dirty = True
         print(f"Connected '{from_node.name}.{from_output}' to '{to_node.name}.{input_name}'")
         return connection
     
@@ -591,10 +959,13 @@ class NodeCanvas(BaseWindow):
         if node.node_type in [NodeType.INPUT, NodeType.OUTPUT]:
             print(f"Cannot delete {node.node_type.value} node")
             return
-        self.connections = [c for c in self.connections 
-                          if c.from_node != node and c.to_node != node]
+        for connection in tuple(node._in_conns | node._out_conns):
+            self._forget_connection(connection)
         if node in self.nodes:
             self.nodes.remove(node)
+        self._grid_dirty = True
+        self._points_dirty = True
+        self._dirty = True
         if node in self.selected_nodes:
             self.selected_nodes.remove(node)
         return
@@ -606,10 +977,34 @@ class NodeCanvas(BaseWindow):
         Args:
             connection: Connection to remove
         """
-        if connection in self.connections:
-            self.connections.remove(connection)
+        if connection in connection.from_node._out_conns:
+            self._forget_connection(connection)
+            self._dirty = True
         return
     
+    def _forget_connection(self, connection: Connection) -> None:
+        """
+        Drop a connection from the list, the duplicate keys and its endpoints
+        
+        Args:
+            connection: Connection to forget
+        """
+        self.connections.remove(connection)
+        self._connection_keys.discard((connection.from_node.id, connection.to_node.id,
+                                       connection.to_parameter, connection.from_output))
+        connection.from_node._out_conns.discard(connection)
+        connection.to_node._in_conns.discard(connection)
+        return
+    
+    def get_culled_counts(self) -> Tuple[int, int]:
+        """
+        Get how many nodes and connections the last redraw skipped as off-screen
+        
+        Returns:
+            Tuple of (culled nodes, culled connections)
+        """
+        return self._culled_nodes, self._culled_connections
+    
     def get_selected_node(self) -> Optional[CanvasNode]:
         """
         Get the currently selected node (for parameter editing)
@@ -633,9 +1028,10 @@ class NodeCanvas(BaseWindow):
         Returns:
             Position in canvas coordinates
         """
+        inverse_zoom = self._ts_iz
         return (
-            (screen_pos[0] - self.rect.x - self.pan_offset[0]) / self.zoom,
-            (screen_pos[1] - self.rect.y - self.pan_offset[1]) / self.zoom
+            (screen_pos[0] - self._ts_x) * inverse_zoom,
+            (screen_pos[1] - self._ts_y) * inverse_zoom
         )
     
     def canvas_to_screen(self, canvas_pos: Tuple[float, float]) -> Tuple[float, float]:
@@ -648,26 +1044,64 @@ class NodeCanvas(BaseWindow):
         Returns:
             Position in screen coordinates
         """
+        zoom = self._ts_z
         return (
-            canvas_pos[0] * self.zoom + self.rect.x + self.pan_offset[0],
-            canvas_pos[1] * self.zoom + self.rect.y + self.pan_offset[1]
+            canvas_pos[0] * zoom + self._ts_x,
+            canvas_pos[1] * zoom + self._ts_y
         )
     
-    def _handle_zoom(self, event) -> None:
-        """Handle mouse wheel zoom"""
-        mouse_pos = mouse.get_pos()
+    def _get_view_canvas_rect(self, screen_margin: int = 0) -> Rect:
+        """
+        Get the visible canvas area in canvas coordinates
+        
+        Args:
+            screen_margin: Extra border (in screen pixels) added on every side
+            
+        Returns:
+            Rect covering the view, rounded outwards
+        """
+        left, top = self.screen_to_canvas(self.rect.topleft)
+        margin = ceil(screen_margin * self._ts_iz)
+        return Rect(floor(left) - margin, floor(top) - margin,
+                    ceil(self.rect.width * self._ts_iz) + 2 * margin + 1,
+                    ceil(self.rect.height * self._ts_iz) + 2 * margin + 1)
+    
+    def _update_transform_consts(self) -> None:
+        """
+        Cache the screen offset, zoom and inverse zoom of the view transform
+        
+        Must be called whenever the canvas rect, pan offset or zoom changes.
+        """
+        self._ts_x = self.rect.x + self.pan_offset[0]
+        self._ts_y = self.rect.y + self.pan_offset[1]
+        self._ts_z = self.zoom
+        self._ts_iz = 1.0 / self.zoom
+        return
+    
+    def _handle_zoom(self, event, mouse_pos: Tuple[int, int]) -> None:
+        """
+        Handle mouse wheel zoom around the cursor
+        
+        Args:
+            event: Pygame MOUSEWHEEL event
+            mouse_pos: Last known cursor position in screen coordinates
+        """
         old_canvas_pos = self.screen_to_canvas(mouse_pos)
         if event.y > 0:
             self.zoom = min(self.MAX_ZOOM, self.zoom + self.ZOOM_STEP)
         else:
             self.zoom = max(self.MIN_ZOOM, self.zoom - self.ZOOM_STEP)
+        self._update_transform_consts()
         new_canvas_pos = self.screen_to_canvas(mouse_pos)
         self.pan_offset[0] += (new_canvas_pos[0] - old_canvas_pos[0]) * self.zoom
         self.pan_offset[1] += (new_canvas_pos[1] - old_canvas_pos[1]) * self.zoom
+        self._update_transform_consts()
+        self._dirty = True
         return
     
     def _handle_mouse_down(self, event) -> None:
         """Handle mouse button down events"""
+        self._dirty = True
         canvas_pos = self.screen_to_canvas(event.pos)
         if event.button == 1:
             if self._try_start_connection(canvas_pos, event.pos):
@@ -693,13 +1127,11 @@ class NodeCanvas(BaseWindow):
         Returns:
             True if connection started
         """
-        for node in self.nodes:
-            output_name = node.get_output_at_position(canvas_pos)
-            if output_name:
-                self.dragging_connection = node
-                self.dragging_output_name = output_name
-                self.temp_connection_pos = screen_pos
-                return True
+        hit = self._find_connection_point(canvas_pos, is_input=False)
+        if hit:
+            self.dragging_connection, self.dragging_output_name = hit
+            self.temp_connection_pos = screen_pos
+            return True
         return False
     
     def _try_select_node(self, canvas_pos: Tuple[float, float]) -> bool:
@@ -747,15 +1179,99 @@ class NodeCanvas(BaseWindow):
         """
         canvas_pos = self.screen_to_canvas(screen_pos)
         from_output = self.dragging_output_name
-        for node in self.nodes:
-            if node == self.dragging_connection:
-                continue
-            input_name = node.get_input_at_position(canvas_pos)
-            if input_name:
-                self.add_connection(self.dragging_connection, node, input_name, from_output)
-                break
+        hit = self._find_connection_point(canvas_pos, is_input=True, 
+                                          exclude=self.dragging_connection)
+        if hit:
+            self.add_connection(self.dragging_connection, hit[0], hit[1], from_output)
         return
     
+    def _rebuild_point_arrays(self) -> None:
+        """
+        Flatten all connection point positions into contiguous arrays
+        
+        Inputs and outputs each get an (M, 2) position array plus parallel
+        owner indices (into the node list) and point names.
+        """
+        in_xy, in_owner, in_names = [], [], []
+        out_xy, out_owner, out_names = [], [], []
+        point_slices = {}
+        for index, node in enumerate(self.nodes):
+            in_start, out_start = len(in_xy), len(out_xy)
+            for name, point in node.input_points.items():
+                in_xy.append(point.position)
+                in_owner.append(index)
+                in_names.append(name)
+            for name, point in node.output_points.items():
+                out_xy.append(point.position)
+                out_owner.append(index)
+                out_names.append(name)
+            point_slices[node.id] = (in_start, len(in_xy), out_start, len(out_xy))
+        self._in_xy = array(in_xy, dtype=float32).reshape(-1, 2)
+        self._in_owner = array(in_owner, dtype=int32)
+        self._in_names = in_names
+        self._out_xy = array(out_xy, dtype=float32).reshape(-1, 2)
+        self._out_owner = array(out_owner, dtype=int32)
+        self._out_names = out_names
+        self._point_owner_nodes = list(self.nodes)
+        self._point_slices = point_slices
+        self._points_dirty = False
+        self._points_epoch = CanvasNode.geometry_epoch
+        self._points_node_count = len(self.nodes)
+        return
+    
+    def _shift_point_arrays(self, node: CanvasNode, dx: float, dy: float) -> None:
+        """
+        Move a node's rows in the connection point arrays by an offset
+        
+        Falls back to a lazy rebuild if the node is not in the arrays.
+        
+        Args:
+            node: Node that moved
+            dx: Offset in X
+            dy: Offset in Y
+        """
+        point_slice = self._point_slices.get(node.id)
+        if self._points_dirty or point_slice is None:
+            self._points_dirty = True
+            return
+        in_start, in_end, out_start, out_end = point_slice
+        self._in_xy[in_start:in_end] += (dx, dy)
+        self._out_xy[out_start:out_end] += (dx, dy)
+        return
+    
+    def _find_connection_point(self, canvas_pos: Tuple[float, float], is_input: bool, 
+                               exclude: Optional[CanvasNode] = None) -> Optional[Tuple[CanvasNode, str]]:
+        """
+        Find the closest connection point within the pick threshold
+        
+        Args:
+            canvas_pos: Position in canvas coordinates
+            is_input: Search input points if True, output points otherwise
+            exclude: Node whose points are ignored
+            
+        Returns:
+            (node, point name) or None
+        """
+        if not self._nodes_near(canvas_pos):
+            return None
+        if (self._points_dirty or self._points_node_count != len(self.nodes)
+                or self._points_epoch != CanvasNode.geometry_epoch):
+            self._rebuild_point_arrays()
+        if is_input:
+            xy, owners, names = self._in_xy, self._in_owner, self._in_names
+        else:
+            xy, owners, names = self._out_xy, self._out_owner, self._out_names
+        if not names:
+            return None
+        diff = xy - array(canvas_pos, dtype=float32)
+        distances_sq = einsum('ij,ij->i', diff, diff)
+        if exclude is not None and exclude in self._point_owner_nodes:
+            distances_sq[owners == self._point_owner_nodes.index(exclude)] = inf
+        closest = int(distances_sq.argmin())
+        if distances_sq[closest] >= CanvasNode.CONNECTION_POINT_THRESHOLD_SQ:
+            return None
+        return self._point_owner_nodes[owners[closest]], names[closest]
+    
     def _handle_right_mouse_up(self, event) -> None:
         """Handle right mouse button release (delete connections/nodes)"""
         canvas_pos = self.screen_to_canvas(event.pos)
@@ -778,13 +1294,11 @@ class NodeCanvas(BaseWindow):
         relative_x = click_x - node_left
         third = relative_x / node_width
         if third < 0.33:
-            connections_to_remove = [c for c in self.connections if c.to_node == node]
-            for conn in connections_to_remove:
+            for conn in tuple(node._in_conns):
                 self.remove_connection(conn)
                 print(f"Deleted connection TO '{node.name}'")
         elif third > 0.67:
-            connections_to_remove = [c for c in self.connections if c.from_node == node]
-            for conn in connections_to_remove:
+            for conn in tuple(node._out_conns):
                 self.remove_connection(conn)
                 print(f"Deleted connection FROM '{node.name}'")
             self.remove_node(node)
@@ -793,21 +1307,27 @@ class NodeCanvas(BaseWindow):
     def _handle_mouse_motion(self, event) -> None:
         """Handle mouse motion events"""
         if self.is_panning and self.pan_start:
-            dx = event.pos[0] - self.pan_start[0]
-            dy = event.pos[1] - self.pan_start[1]
-            self.pan_offset[0] += dx
-            self.pan_offset[1] += dy
+            self.pan_offset[0] += event.pos[0] - self.pan_start[0]
+            self.pan_offset[1] += event.pos[1] - self.pan_start[1]
+            self._update_transform_consts()
             self.pan_start = event.pos
-        elif self.dragging_connection:
+            self._dirty = True
+            return
+        if self.dragging_connection:
             self.temp_connection_pos = event.pos
+            self._dirty = True
         else:
             canvas_pos = self.screen_to_canvas(event.pos)
             for node in self.nodes:
                 if node.dragging:
+                    old_x, old_y = node.rect.x, node.rect.y
                     node.move_to(
                         canvas_pos[0] - node.drag_offset[0],
                         canvas_pos[1] - node.drag_offset[1]
                     )
+                    self._grid_dirty = True
+                    self._shift_point_arrays(node, node.rect.x - old_x, node.rect.y - old_y)
+                    self._dirty = True
         return
     
     def _delete_selected_nodes(self) -> None:
@@ -821,119 +1341,351 @@ class NodeCanvas(BaseWindow):
         scaled_grid_size = int(self.grid_size * self.zoom)
         if scaled_grid_size < self.MIN_GRID_SIZE_DISPLAY:
             return
-        offset_x = int(self.pan_offset[0] % scaled_grid_size)
-        for x in range(0, self.rect.width, scaled_grid_size):
-            draw.line(surface, self.grid_color,
-                     (self.rect.x + x + offset_x, self.rect.y),
-                     (self.rect.x + x + offset_x, self.rect.bottom))
-        offset_y = int(self.pan_offset[1] % scaled_grid_size)
-        for y in range(0, self.rect.height, scaled_grid_size):
-            draw.line(surface, self.grid_color,
-                     (self.rect.x, self.rect.y + y + offset_y),
-                     (self.rect.right, self.rect.y + y + offset_y))
+        grid_surface = self._get_grid_surface(scaled_grid_size, surface)
+        if scaled_grid_size & (scaled_grid_size - 1) == 0:
+            mask = scaled_grid_size - 1
+            offset_x = floor(self.pan_offset[0]) & mask
+            offset_y = floor(self.pan_offset[1]) & mask
+        else:
+            offset_x = int(self.pan_offset[0] % scaled_grid_size)
+            offset_y = int(self.pan_offset[1] % scaled_grid_size)
+        view = self._frame_view
+        surface.blit(grid_surface, (view.x + offset_x - scaled_grid_size,
+                                    view.y + offset_y - scaled_grid_size))
+        return
+    
+    def _get_grid_surface(self, scaled_grid_size: int, target: Surface) -> Surface:
+        """
+        Get a pre-rendered grid one cell larger than the canvas in each direction
+        
+        The surface is filled with the background color, so blitting it at the
+        pan offset (clipped to the canvas) replaces all per-line draw calls.
+        It is created in the pixel format of the target surface so the blit
+        is a plain copy without per-pixel conversion.
+        
+        Args:
+            scaled_grid_size: Grid spacing in screen pixels
+            target: Surface the grid will be blitted onto
+            
+        Returns:
+            Cached grid surface
+        """
+        key = (scaled_grid_size, self.rect.size, self.grid_color, self.background_color,
+               target.get_bitsize(), target.get_masks())
+        if key != self._grid_surface_key:
+            width = self.rect.width + scaled_grid_size
+            height = self.rect.height + scaled_grid_size
+            grid_surface = Surface((width, height), 0, target)
+            grid_surface.fill(self.background_color)
+            column = Surface((1, height), 0, target)
+            column.fill(self.grid_color)
+            row = Surface((width, 1), 0, target)
+            row.fill(self.grid_color)
+            grid_surface.blits([(column, (x, 0)) for x in range(0, width, scaled_grid_size)]
+                               + [(row, (0, y)) for y in range(0, height, scaled_grid_size)],
+                               doreturn=False)
+            self._grid_surface = grid_surface
+            self._grid_surface_key = key
+        return self._grid_surface
+    
+    def _get_font(self, size: int) -> font.Font:
+        """
+        Get a default system font of the given size, creating it only once
+        
+        Args:
+            size: Font size in pixels
+            
+        Returns:
+            Cached pygame Font
+        """
+        cached_font = self._font_cache.get(size)
+        if cached_font is None:
+            cached_font = font.SysFont(None, size)
+            self._font_cache[size] = cached_font
+        return cached_font
+    
+    def _update_scaled_fonts(self) -> None:
+        """
+        Resolve the zoom-scaled node font sizes once per frame
+        
+        Sizes are rounded to FONT_SIZE_STEP pixels so that small zoom steps
+        keep hitting the font and text caches.
+        """
+        zoom = self.zoom
+        step = self.FONT_SIZE_STEP
+        self._scaled_font_size = max(self.MIN_SCALED_FONT, 
+                                     step * round(self.font_size * zoom / step))
+        self._scaled_small_font_size = max(self.MIN_SCALED_TINY_FONT, 
+                                           step * round(self.small_font_size * zoom / step))
+        self._scaled_tiny_font_size = max(self.MIN_SCALED_TINY_FONT, 
+                                          step * round(self.TINY_FONT_SIZE * zoom / step))
+        return
+    
+    def _render_text(self, text: str, size: int, color: Tuple[int, int, int]):
+        """
+        Render text with a cached default font, reusing earlier renders
+        
+        Args:
+            text: Text to render
+            size: Font size in pixels
+            color: RGB text color
+            
+        Returns:
+            Pygame surface with the rendered text
+        """
+        key = (text, size, color)
+        text_surface = self._text_cache.get(key)
+        if text_surface is None:
+            text_surface = self._get_font(size).render(text, True, color)
+            self._text_cache[key] = text_surface
+            if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        return text_surface
+    
+    def _build_frame_cache(self) -> None:
+        """
+        Transform every node rect and connection point to frame coordinates once
+        
+        Frame coordinates are screen coordinates relative to the frame origin
+        (see _set_frame_origin). The result is shared by the connection and node drawing passes of
+        the current frame.
+        """
+        nodes = self.nodes
+        frame_cache = {}
+        if not nodes:
+            self._frame_cache = frame_cache
+            return
+        zoom = self._ts_z
+        offset = self._frame_offset
+        screen_rects = array([tuple(node.rect) for node in nodes], dtype=float64) * zoom
+        screen_rects[:, :2] += offset
+        positions = [point.position 
+                     for node in nodes 
+                     for points in (node.input_points, node.output_points) 
+                     for point in points.values()]
+        screen_positions = (array(positions, dtype=float64).reshape(-1, 2) * zoom + offset).tolist()
+        index = 0
+        for node, screen_rect in zip(nodes, screen_rects.tolist()):
+            inputs = {}
+            for name in node.input_points:
+                inputs[name] = screen_positions[index]
+                index += 1
+            outputs = {}
+            for name in node.output_points:
+                outputs[name] = screen_positions[index]
+                index += 1
+            frame_cache[node.id] = (Rect(screen_rect), inputs, outputs)
+        self._frame_cache = frame_cache
         return
     
-    def _draw_node(self, surface, node: CanvasNode) -> None:
+    def _collect_visible_nodes(self) -> List[Tuple[CanvasNode, Tuple[Rect, Dict[str, Tuple[float, float]], Dict[str, Tuple[float, float]]]]]:
         """
-        Draw a single node with all its components
+        Cull the nodes once per frame and pair each visible node with its frame cache entry
+        
+        Returns:
+            List of (node, (frame rect, input positions, output positions)) in drawing order
+        """
+        margin = 2 * max(self.NODE_SELECTION_INFLATE, 
+                         int(self.CONNECTION_POINT_RADIUS * self.zoom) + self.CONNECTION_POINT_BORDER)
+        view = self._frame_view
+        frame_cache = self._frame_cache
+        visible = []
+        for node in self._query_nodes(self._get_view_canvas_rect(margin)):
+            frame_entry = frame_cache.get(node.id)
+            if frame_entry is None:
+                continue
+            if view.colliderect(frame_entry[0].inflate(margin, margin)):
+                visible.append((node, frame_entry))
+        self._culled_nodes = len(self.nodes) - len(visible)
+        return visible
+    
+    def _update_node_face(self, node: CanvasNode, size: Tuple[int, int], 
+                          border_width: int, show_category: bool) -> None:
+        """
+        Re-render the cached node selection outline, body, header and text if needed
+        
+        The surface is re-rendered only when something that affects its look
+        changes; moving or panning a node just blits it somewhere else. It is
+        widened to fit a name or category longer than the node, and the node's
+        position on it is stored in _cached_offset.
         
         Args:
-            surface: Pygame surface to draw on
-            node: Node to draw
+            node: Node whose face is needed
+            size: Node size in screen pixels
+            border_width: Width of the node border
+            show_category: Whether the category line is drawn below the header
         """
-        screen_rect = self._node_rect_to_screen(node.rect)
+        key = (size, self.zoom, self._scaled_font_size, self._scaled_small_font_size,
+               node.color, node.name, node.category, node.selected, border_width, show_category)
+        if key == node._cached_key:
+            return
+        pad = self.NODE_SELECTION_INFLATE
+        show_text = self.zoom >= self.TEXT_MIN_ZOOM
+        text_width = 0
+        if show_text:
+            text_width = self._render_text(node.name, self._scaled_font_size, self.text_color).get_width()
+            if show_category and node.category:
+                text_width = max(text_width, self._render_text(node.category, self._scaled_small_font_size, 
+                                                               self.node_label_color).get_width())
+        pad_x = pad + max(0, text_width - size[0] + 1) // 2
+        face = Surface((size[0] + 2 * pad_x, size[1] + 2 * pad), SRCALPHA)
+        local_rect = Rect(pad_x, pad, size[0], size[1])
         if node.selected:
-            self._draw_node_selection(surface, screen_rect)
-        self._draw_node_body(surface, node, screen_rect)
-        self._draw_node_header(surface, node, screen_rect)
-        self._draw_node_text(surface, node, screen_rect)
-        self._draw_connection_points(surface, node)
+            self._draw_node_selection(face, local_rect)
+        self._draw_node_body(face, node, local_rect, border_width)
+        header_height = self._draw_node_header(face, node, local_rect)
+        if show_text:
+            self._draw_node_name(face, node, local_rect, header_height)
+            if show_category:
+                self._draw_node_category(face, node, local_rect, header_height)
+        node._cached_surf = face
+        node._cached_key = key
+        node._cached_offset = (pad_x, pad)
         return
     
-    def _node_rect_to_screen(self, rect: Rect) -> Rect:
-        """Convert node rect from canvas to screen coordinates"""
-        return Rect(
-            rect.x * self.zoom + self.rect.x + self.pan_offset[0],
-            rect.y * self.zoom + self.rect.y + self.pan_offset[1],
-            rect.width * self.zoom,
-            rect.height * self.zoom
-        )
-    
     def _draw_node_selection(self, surface, screen_rect: Rect) -> None:
         """Draw selection highlight around node"""
-        selection_rect = screen_rect.inflate(
-            self.NODE_SELECTION_INFLATE, 
-            self.NODE_SELECTION_INFLATE
-        )
+        selection_rect = self._scratch_rect
+        selection_rect.update(screen_rect)
+        selection_rect.inflate_ip(self.NODE_SELECTION_INFLATE, self.NODE_SELECTION_INFLATE)
         draw.rect(surface, self.selection_color, selection_rect, 
                  self.NODE_SELECTION_BORDER, 
                  border_radius=self.NODE_SELECTION_RADIUS)
         return
     
-    def _draw_node_body(self, surface, node: CanvasNode, screen_rect: Rect) -> None:
+    def _draw_node_body(self, surface, node: CanvasNode, screen_rect: Rect, border_width: int) -> None:
         """Draw node background and border"""
         draw.rect(surface, node.color, screen_rect, border_radius=self.NODE_BORDER_RADIUS)
-        border_width = (self.NODE_BORDER_WIDTH_SPECIAL 
-                       if node.node_type in [NodeType.INPUT, NodeType.OUTPUT] 
-                       else self.NODE_BORDER_WIDTH_NORMAL)
         draw.rect(surface, self.NODE_BORDER_COLOR, screen_rect, border_width, 
                  border_radius=self.NODE_BORDER_RADIUS)
         return
     
-    def _draw_node_header(self, surface, node: CanvasNode, screen_rect: Rect) -> None:
-        """Draw node header bar"""
+    def _draw_node_header(self, surface, node: CanvasNode, screen_rect: Rect) -> int:
+        """
+        Draw node header bar
+        
+        Returns:
+            Height of the header in screen pixels
+        """
         header_height = int(node.header_height * self.zoom)
-        header_rect = Rect(screen_rect.x, screen_rect.y, screen_rect.width, header_height)
-        header_color = tuple(max(0, c - self.HEADER_DARKEN_AMOUNT) for c in node.color)
+        header_rect = self._scratch_rect
+        header_rect.update(screen_rect.x, screen_rect.y, screen_rect.width, header_height)
+        header_color = self._header_colors.get(node.color)
+        if header_color is None:
+            header_color = self._darken_color(node.color)
         draw.rect(surface, header_color, header_rect, 
                  border_top_left_radius=self.NODE_BORDER_RADIUS,
                  border_top_right_radius=self.NODE_BORDER_RADIUS)
-        return
+        return header_height
     
-    def _draw_node_text(self, surface, node: CanvasNode, screen_rect: Rect) -> None:
-        """Draw node name and category text"""
-        header_height = int(node.header_height * self.zoom)
-        header_rect = Rect(screen_rect.x, screen_rect.y, screen_rect.width, header_height)
-        scaled_font_size = max(self.MIN_SCALED_FONT, int(self.font_size * self.zoom))
-        scaled_font = font.SysFont(None, scaled_font_size)
-        name_text = scaled_font.render(node.name, True, self.text_color)
-        name_rect = name_text.get_rect(center=(header_rect.centerx, header_rect.centery))
+    def _darken_color(self, color: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        Get the header shade of a node color and remember it
+        
+        Args:
+            color: Node body color
+            
+        Returns:
+            Color darkened by CanvasNode.HEADER_DARKEN_AMOUNT, clamped at 0
+        """
+        amount = CanvasNode.HEADER_DARKEN_AMOUNT
+        darkened = tuple([c - amount if c > amount else 0 for c in color])
+        self._header_colors[color] = darkened
+        return darkened
+    
+    def _draw_node_name(self, surface, node: CanvasNode, screen_rect: Rect, header_height: int) -> None:
+        """Draw node name centered in the header"""
+        name_text = self._render_text(node.name, self._scaled_font_size, self.text_color)
+        name_rect = name_text.get_rect(center=(screen_rect.centerx, 
+                                               screen_rect.y + header_height // 2))
         surface.blit(name_text, name_rect)
-        if node.category and node.node_type != NodeType.PROCESS:
-            scaled_small_font_size = max(self.MIN_SCALED_TINY_FONT, 
-                                        int(self.small_font_size * self.zoom))
-            scaled_small_font = font.SysFont(None, scaled_small_font_size)
-            cat_text = scaled_small_font.render(node.category, True, self.node_label_color)
-            cat_y = screen_rect.y + header_height + int(self.CATEGORY_TEXT_Y_OFFSET * self.zoom)
-            cat_rect = cat_text.get_rect(center=(screen_rect.centerx, cat_y))
-            surface.blit(cat_text, cat_rect)
         return
     
-    def _draw_connection_points(self, surface, node: CanvasNode) -> None:
-        """Draw all connection points for a node"""
+    def _draw_node_category(self, surface, node: CanvasNode, screen_rect: Rect, header_height: int) -> None:
+        """Draw node category below the header"""
+        if not node.category:
+            return
+        cat_text = self._render_text(node.category, self._scaled_small_font_size, 
+                                     self.node_label_color)
+        cat_y = screen_rect.y + header_height + int(self.CATEGORY_TEXT_Y_OFFSET * self.zoom)
+        cat_rect = cat_text.get_rect(center=(screen_rect.centerx, cat_y))
+        surface.blit(cat_text, cat_rect)
+        return
+    
+    def _draw_connection_points(self, blits: List[Tuple[Surface, Any]], node: CanvasNode, 
+                                screen_inputs: Dict[str, Tuple[float, float]], 
+                                screen_outputs: Dict[str, Tuple[float, float]]) -> None:
+        """Draw all connection points for a node from their screen positions"""
         point_radius = max(4, int(self.CONNECTION_POINT_RADIUS * self.zoom))
-        scaled_tiny_font_size = max(self.MIN_SCALED_TINY_FONT, 
-                                   int(self.TINY_FONT_SIZE * self.zoom))
-        scaled_tiny_font = font.SysFont(None, scaled_tiny_font_size)
-        for name, point in node.input_points.items():
-            screen_pos = self.canvas_to_screen(point.position)
-            self._draw_connection_point(surface, screen_pos, self.INPUT_POINT_COLOR, 
-                                       point_radius, name, scaled_tiny_font, is_input=True)
-        for name, point in node.output_points.items():
-            screen_pos = self.canvas_to_screen(point.position)
-            self._draw_connection_point(surface, screen_pos, self.OUTPUT_POINT_COLOR, 
-                                       point_radius, name, scaled_tiny_font, is_input=False)
+        if self.zoom < self.LABEL_MIN_ZOOM:
+            labels = {}
+        else:
+            labels = self._get_node_label_surfaces(node, self._scaled_tiny_font_size)
+        if screen_inputs:
+            sprite = self._get_port_sprite(self.INPUT_POINT_COLOR, point_radius)
+            for name, screen_pos in screen_inputs.items():
+                self._draw_connection_point(blits, screen_pos, sprite, 
+                                           point_radius, labels.get(name), is_input=True)
+        if screen_outputs:
+            sprite = self._get_port_sprite(self.OUTPUT_POINT_COLOR, point_radius)
+            for name, screen_pos in screen_outputs.items():
+                self._draw_connection_point(blits, screen_pos, sprite, 
+                                           point_radius, labels.get(name), is_input=False)
         return
     
-    def _draw_connection_point(self, surface, screen_pos: Tuple[float, float], 
-                              color: Tuple[int, int, int], radius: int, 
-                              label: str, label_font: font.Font, is_input: bool) -> None:
-        """Draw a single connection point with label"""
-        draw.circle(surface, color, (int(screen_pos[0]), int(screen_pos[1])), radius)
-        draw.circle(surface, self.CONNECTION_POINT_BORDER_COLOR, 
-                   (int(screen_pos[0]), int(screen_pos[1])), radius, 
-                   self.CONNECTION_POINT_BORDER)
-        label_text = label_font.render(label, True, self.node_label_color)
+    def _get_node_label_surfaces(self, node: CanvasNode, label_size: int) -> Dict[str, Surface]:
+        """
+        Get the rendered connection point labels of a node
+        
+        The labels are kept on the node and only re-rendered when the label
+        font size changes (zoom or window resize) or a point is added.
+        
+        Args:
+            node: Node whose labels are needed
+            label_size: Label font size in pixels
+            
+        Returns:
+            Dictionary of point name to rendered label
+        """
+        labels = node._label_surfaces
+        if node._label_size != label_size:
+            labels.clear()
+            node._label_size = label_size
+        for names in (node.input_points, node.output_points):
+            for name in names:
+                if name not in labels:
+                    labels[name] = self._render_text(name, label_size, self.node_label_color)
+        return labels
+    
+    def _get_port_sprite(self, color: Tuple[int, int, int], radius: int) -> Surface:
+        """
+        Get a pre-rendered connection point circle with its border
+        
+        Args:
+            color: RGB fill color
+            radius: Circle radius in pixels
+            
+        Returns:
+            Transparent surface of size (2 * radius + 1) squared
+        """
+        key = (color, radius)
+        sprite = self._port_sprites.get(key)
+        if sprite is None:
+            size = 2 * radius + 1
+            sprite = Surface((size, size), SRCALPHA)
+            draw.circle(sprite, color, (radius, radius), radius)
+            draw.circle(sprite, self.CONNECTION_POINT_BORDER_COLOR, (radius, radius), radius, 
+                       self.CONNECTION_POINT_BORDER)
+            self._port_sprites[key] = sprite
+        return sprite
+    
+    def _draw_connection_point(self, blits: List[Tuple[Surface, Any]], screen_pos: Tuple[float, float], 
+                              sprite: Surface, radius: int, 
+                              label_text: Optional[Surface], is_input: bool) -> None:
+        """Draw a single connection point sprite with its pre-rendered label (None to skip the label)"""
+        blits.append((sprite, (int(screen_pos[0]) - radius, int(screen_pos[1]) - radius)))
+        if label_text is None:
+            return
         if is_input:
             label_rect = label_text.get_rect(
                 left=screen_pos[0] + radius + self.CONNECTION_POINT_LABEL_OFFSET,
@@ -944,23 +1696,126 @@ class NodeCanvas(BaseWindow):
                 right=screen_pos[0] - radius - self.CONNECTION_POINT_LABEL_OFFSET,
                 centery=screen_pos[1]
             )
-        surface.blit(label_text, label_rect)
+        blits.append((label_text, label_rect))
+        return
+    
+    def _draw_connections(self, surface) -> None:
+        """
+        Draw all connections, evaluating every changed bezier curve in one batch
+        
+        Each connection keeps its sampled curve keyed by its screen endpoints,
+        which already include pan and zoom, so curves are only re-sampled
+        after their endpoints moved on screen.
+        
+        Args:
+            surface: Pygame surface to draw on
+        """
+        view = self._frame_view
+        half_width = self.CONNECTION_WIDTH
+        connections = []
+        keys = []
+        for connection in self.connections:
+            endpoints = self._get_connection_screen_endpoints(connection)
+            if endpoints is None:
+                continue
+            connections.append(connection)
+            keys.append((endpoints[0][0], endpoints[0][1], endpoints[1][0], endpoints[1][1]))
+        if not keys:
+            self._culled_connections = len(self.connections)
+            return
+        endpoints = array(keys, dtype=float64)
+        control_points = self._bezier_control_point_array(endpoints)
+        low = control_points.min(axis=1) - half_width
+        high = control_points.max(axis=1) + half_width
+        in_view = flatnonzero((high[:, 0] >= view.left) & (low[:, 0] <= view.right)
+                              & (high[:, 1] >= view.top) & (low[:, 1] <= view.bottom))
+        visible = []
+        stale = []
+        stale_indices = []
+        for index in in_view.tolist():
+            connection = connections[index]
+            key = keys[index]
+            if key != connection._cached_key:
+                connection._cached_key = key
+                stale.append(connection)
+                stale_indices.append(index)
+            visible.append(connection)
+        self._culled_connections = len(self.connections) - len(visible)
+        if stale_indices:
+            self._sample_stale_connections(stale, stale_indices, endpoints, control_points)
+        for connection in visible:
+            draw.lines(surface, self._get_connection_color(connection), False, 
+                       connection._cached_pts, self.CONNECTION_WIDTH)
         return
     
-    def _draw_connection(self, surface, connection: Connection) -> None:
-        """Draw a connection between nodes"""
+    def _sample_stale_connections(self, stale: List[Connection], stale_indices: List[int],
+                                  endpoints, control_points) -> None:
+        """
+        Re-sample changed curves with a segment count matching their screen length
+        
+        Curves are grouped by segment count so each group is still sampled in
+        one batch. Curves shorter than CONNECTION_MIN_CURVE_LENGTH become a
+        single straight segment.
+        
+        Args:
+            stale: Connections whose cached points are outdated
+            stale_indices: Row of each stale connection in the arrays below
+            endpoints: Array of shape (curves, 4) with the screen endpoints
+            control_points: Array of shape (curves, 4, 2)
+        """
+        stale_endpoints = endpoints[stale_indices]
+        lengths = (absolute(stale_endpoints[:, 2] - stale_endpoints[:, 0])
+                   + absolute(stale_endpoints[:, 3] - stale_endpoints[:, 1])).tolist()
+        groups: Dict[int, Tuple[List[Connection], List[int]]] = {}
+        for connection, index, length, ends in zip(stale, stale_indices, lengths, 
+                                                   stale_endpoints.tolist()):
+            if length < self.CONNECTION_MIN_CURVE_LENGTH:
+                connection._cached_pts = [[int(ends[0]), int(ends[1])], [int(ends[2]), int(ends[3])]]
+                continue
+            group = groups.setdefault(self._segments_for_length(length), ([], []))
+            group[0].append(connection)
+            group[1].append(index)
+        for segments, (connections, indices) in groups.items():
+            curves = _sample_bezier_curves(control_points[indices], _get_bezier_basis(segments))
+            for connection, curve in zip(connections, curves.tolist()):
+                connection._cached_pts = curve
+        return
+    
+    def _segments_for_length(self, length: float) -> int:
+        """
+        Get the bezier segment count for a curve of the given screen length
+        
+        Args:
+            length: Manhattan distance between the curve endpoints in pixels
+            
+        Returns:
+            Multiple of CONNECTION_MIN_SEGMENTS, at most CONNECTION_BEZIER_SEGMENTS
+        """
+        step = self.CONNECTION_MIN_SEGMENTS
+        segments = int(length) // self.CONNECTION_PIXELS_PER_SEGMENT // step * step
+        return min(self.CONNECTION_BEZIER_SEGMENTS, max(step, segments))
+    
+    def _get_connection_screen_endpoints(self, connection: Connection) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """Get the screen positions of both ends of a connection"""
+        from_entry = self._frame_cache.get(connection.from_node.id)
+        to_entry = self._frame_cache.get(connection.to_node.id)
+        if from_entry is not None and to_entry is not None:
+            start_screen = from_entry[2].get(connection.from_output)
+            end_screen = to_entry[1].get(connection.to_parameter)
+            if start_screen is None or end_screen is None:
+                return None
+            return start_screen, end_screen
         start_pos = connection.get_start_position()
         end_pos = connection.get_end_position()
         if not start_pos or not end_pos:
-            return
-        start_screen = self.canvas_to_screen(start_pos)
-        end_screen = self.canvas_to_screen(end_pos)
+            return None
+        return self._canvas_to_frame(start_pos), self._canvas_to_frame(end_pos)
+    
+    def _get_connection_color(self, connection: Connection) -> Tuple[int, int, int]:
+        """Get the line color of a connection"""
         if connection.to_parameter and connection.to_parameter != "image":
-            color = self.PARAM_INPUT_POINT_COLOR
-        else:
-            color = self.selection_color if connection.selected else self.connection_color
-        self._draw_bezier_connection(surface, start_screen, end_screen, color)
-        return
+            return self.PARAM_INPUT_POINT_COLOR
+        return self.selection_color if connection.selected else self.connection_color
     
     def _draw_temp_connection(self, surface) -> None:
         """Draw temporary connection while dragging"""
@@ -969,38 +1824,70 @@ class NodeCanvas(BaseWindow):
         from_output = self.dragging_output_name
         output_point = self.dragging_connection.output_points.get(from_output)
         if output_point:
-            from_screen = self.canvas_to_screen(output_point.position)
-            self._draw_bezier_connection(surface, from_screen, self.temp_connection_pos, 
+            from_frame = self._canvas_to_frame(output_point.position)
+            to_frame = (self.temp_connection_pos[0] - self._frame_origin[0],
+                        self.temp_connection_pos[1] - self._frame_origin[1])
+            self._draw_bezier_connection(surface, from_frame, to_frame, 
                                         self.CONNECTION_TEMP_COLOR)
         return
     
     def _draw_bezier_connection(self, surface, start_pos: Tuple[float, float], 
                                end_pos: Tuple[float, float], 
                                color: Tuple[int, int, int]) -> None:
-        """Draw a bezier curve connection"""
+        """Draw a bezier curve connection as a single polyline"""
+        length = abs(end_pos[0] - start_pos[0]) + abs(end_pos[1] - start_pos[1])
+        if length < self.CONNECTION_MIN_CURVE_LENGTH:
+            draw.line(surface, color, start_pos, end_pos, self.CONNECTION_WIDTH)
+            return
+        control_points = array([self._bezier_control_points(start_pos, end_pos)], dtype=float64)
+        basis = _get_bezier_basis(self._segments_for_length(length))
+        points = _sample_bezier_curves(control_points, basis)[0].tolist()
+        draw.lines(surface, color, False, points, self.CONNECTION_WIDTH)
+        return
+    
+    def _bezier_control_points(self, start_pos: Tuple[float, float], 
+                               end_pos: Tuple[float, float]) -> Tuple[Tuple[float, float], ...]:
+        """
+        Get the four control points of the bezier curve between two positions
+        
+        Args:
+            start_pos: Start of the curve in screen coordinates
+            end_pos: End of the curve in screen coordinates
+            
+        Returns:
+            Tuple of the four control points
+        """
         dx = end_pos[0] - start_pos[0]
         control_offset = abs(dx) * self.CONNECTION_CONTROL_FACTOR
         control_offset = max(self.CONNECTION_CONTROL_OFFSET_MIN, 
                            min(control_offset, self.CONNECTION_CONTROL_OFFSET_MAX))
-        points = []
-        for i in range(self.CONNECTION_BEZIER_SEGMENTS + 1):
-            t = i / self.CONNECTION_BEZIER_SEGMENTS
-            p0 = start_pos
-            p1 = (start_pos[0] + control_offset, start_pos[1])
-            p2 = (end_pos[0] - control_offset, end_pos[1])
-            p3 = end_pos
-            x = ((1-t)**3 * p0[0] + 
-                 3*(1-t)**2*t * p1[0] + 
-                 3*(1-t)*t**2 * p2[0] + 
-                 t**3 * p3[0])
-            y = ((1-t)**3 * p0[1] + 
-                 3*(1-t)**2*t * p1[1] + 
-                 3*(1-t)*t**2 * p2[1] + 
-                 t**3 * p3[1])
-            points.append((int(x), int(y)))
-        if len(points) > 1:
-            draw.lines(surface, color, False, points, self.CONNECTION_WIDTH)
-        return
+        return (
+            start_pos,
+            (start_pos[0] + control_offset, start_pos[1]),
+            (end_pos[0] - control_offset, end_pos[1]),
+            end_pos
+        )
+    
+    def _bezier_control_point_array(self, endpoints):
+        """
+        Vectorized _bezier_control_points for many curves at once
+        
+        Args:
+            endpoints: Array of shape (curves, 4) with start x, start y, end x, end y
+            
+        Returns:
+            Array of control points with shape (curves, 4, 2)
+        """
+        control_offset = clip(absolute(endpoints[:, 2] - endpoints[:, 0]) * self.CONNECTION_CONTROL_FACTOR,
+                              self.CONNECTION_CONTROL_OFFSET_MIN, self.CONNECTION_CONTROL_OFFSET_MAX)
+        control_points = empty((endpoints.shape[0], 4, 2), dtype=float64)
+        control_points[:, 0] = endpoints[:, :2]
+        control_points[:, 1] = endpoints[:, :2]
+        control_points[:, 1, 0] += control_offset
+        control_points[:, 2] = endpoints[:, 2:]
+        control_points[:, 2, 0] -= control_offset
+        control_points[:, 3] = endpoints[:, 2:]
+        return control_points
     
     def _add_default_nodes(self) -> None:
         """Add default input and output nodes to canvas"""
@@ -1028,28 +1915,169 @@ class NodeCanvas(BaseWindow):
     
     def _get_node_at_position(self, canvas_pos: Tuple[float, float]) -> Optional[CanvasNode]:
         """Get node at canvas position (topmost node)"""
-        for node in reversed(self.nodes):
-            if node.contains_point(canvas_pos):
-                return node
-        return None
+        self._ensure_spatial_index()
+        shift = self.SPATIAL_CELL_SHIFT
+        bucket = self._grid.get((floor(canvas_pos[0]) >> shift, floor(canvas_pos[1]) >> shift))
+        if not bucket:
+            return None
+        node_z = self._node_z
+        topmost = None
+        topmost_z = -1
+        for node in bucket:
+            z = node_z[node.id]
+            if z > topmost_z and node.contains_point(canvas_pos):
+                topmost = node
+                topmost_z = z
+        return topmost
+    
+    def _cells_for_rect(self, rect: Rect) -> List[Tuple[int, int]]:
+        """
+        Get all spatial index cells overlapped by a rectangle
+        
+        Args:
+            rect: Rectangle in canvas coordinates
+            
+        Returns:
+            List of (cell_x, cell_y) keys
+        """
+        shift = self.SPATIAL_CELL_SHIFT
+        return [(cx, cy)
+                for cx in range((rect.left >> shift), (rect.right >> shift) + 1)
+                for cy in range((rect.top >> shift), (rect.bottom >> shift) + 1)]
+    
+    def _grid_insert(self, node: CanvasNode) -> None:
+        """
+        Insert a node into the spatial index
+        
+        The node rect is inflated by the connection point threshold so that
+        ports sitting on the node border are found from neighbouring cells.
+        
+        Args:
+            node: Node to insert
+        """
+        threshold = CanvasNode.CONNECTION_POINT_THRESHOLD
+        bounds = node.rect.inflate(2 * threshold, 2 * threshold)
+        cells = self._cells_for_rect(bounds)
+        for cell in cells:
+            self._grid.setdefault(cell, []).append(node)
+        self._node_cells[node.id] = cells
+        self._node_bounds[node.id] = bounds
+        if node.id not in self._node_z:
+            self._node_z[node.id] = self._next_z
+            self._next_z += 1
+        return
+    
+    def _rebuild_spatial_index(self) -> None:
+        """Rebuild the spatial index from the current node list"""
+        self._grid.clear()
+        self._node_cells.clear()
+        self._node_bounds.clear()
+        self._node_z.clear()
+        self._next_z = 0
+        for node in self.nodes:
+            self._grid_insert(node)
+        self._grid_dirty = False
+        self._grid_nodes = list(self.nodes)
+        return
+    
+    def _ensure_spatial_index(self) -> None:
+        """
+        Rebuild the spatial index if it may be out of date
+        
+        The canvas marks the index dirty whenever it adds, removes or moves a
+        node, and scenes do so through invalidate(). Nodes appended, removed
+        or swapped in canvas.nodes from outside are caught by comparing the
+        list with the one the index was built from.
+        """
+        if self._grid_dirty or self.nodes != self._grid_nodes:
+            self._rebuild_spatial_index()
+        return
     
-    def _get_parameter_info(self, node_name: str) -> List[Dict[str, Any]]:
-        """Get parameter info for a node type from JSON definitions"""
+    def _nodes_near(self, canvas_pos: Tuple[float, float]) -> List[CanvasNode]:
+        """
+        Get the nodes whose inflated bounds contain a position
+        
+        Args:
+            canvas_pos: Position in canvas coordinates
+            
+        Returns:
+            Candidate nodes in drawing order (topmost last)
+        """
+        self._ensure_spatial_index()
+        shift = self.SPATIAL_CELL_SHIFT
+        bucket = self._grid.get((floor(canvas_pos[0]) >> shift, floor(canvas_pos[1]) >> shift))
+        if not bucket:
+            return []
+        node_bounds = self._node_bounds
+        node_z = self._node_z
+        return sorted((node for node in bucket if node_bounds[node.id].collidepoint(canvas_pos)),
+                      key=lambda node: node_z[node.id])
+    
+    def _query_nodes(self, canvas_rect: Rect) -> List[CanvasNode]:
+        """
+        Get the nodes whose inflated bounds overlap a rectangle
+        
+        Args:
+            canvas_rect: Query rectangle in canvas coordinates
+            
+        Returns:
+            Overlapping nodes in drawing order (topmost last)
+        """
+        self._ensure_spatial_index()
+        node_bounds = self._node_bounds
+        found = {}
+        for cell in self._cells_for_rect(canvas_rect):
+            for node in self._grid.get(cell, ()):
+                if node.id not in found and node_bounds[node.id].colliderect(canvas_rect):
+                    found[node.id] = node
+        node_z = self._node_z
+        return sorted(found.values(), key=lambda node: node_z[node.id])
+    
+    def get_parameter_info(self, node_name: str) -> List[Dict[str, Any]]:
+        """
+        Get the parameter definitions of a node type
+        
+        Args:
+            node_name: Node type name from the node definitions
+            
+        Returns:
+            List of parameter definitions (empty if the node type is unknown)
+        """
+        definition = self._get_node_definition(node_name)
+        return definition.parameter_info if definition else []
+    
+    def _get_node_definition(self, node_name: str) -> Optional[NodeDefinition]:
+        """Look up a node definition by name, rebuilding the index if the JSON was replaced"""
+        if self._definitions is None or self._definitions_source is not self.node_definitions:
+            self._build_node_definitions()
+        return self._definitions.get(node_name)
+    
+    def _build_node_definitions(self) -> None:
+        """Convert the node definitions JSON into NodeDefinition objects (first definition wins)"""
+        definitions = {}
         for category in self.node_definitions.get('categories', []):
+            category_name = category.get('name', '')
             for node in category.get('nodes', []):
-                if node['name'] == node_name:
-                    return node.get('parameters', [])
-        return []
+                if node['name'] not in definitions:
+                    definitions[node['name']] = NodeDefinition(
+                        node['name'], category_name, node.get('parameters', []))
+        self._definitions = definitions
+        self._definitions_source = self.node_definitions
+        return
     
-    def _extract_algorithm_inputs(self, pipeline_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _extract_algorithm_inputs(self, pipeline_data: Dict[str, Any], 
+                                  nodes_by_id: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Extract input parameters from an embedded pipeline"""
+        if nodes_by_id is None:
+            nodes_by_id = {n['id']: n for n in pipeline_data.get('nodes', [])}
         input_params = []
+        input_param_names = set()
         for conn in pipeline_data.get('connections', []):
-            from_node_data = next((n for n in pipeline_data.get('nodes', []) 
-                                 if n['id'] == conn['from_node']), None)
+            from_node_data = nodes_by_id.get(conn['from_node'])
             if from_node_data and from_node_data.get('node_type') == 'input':
                 param_name = conn.get('to_parameter')
-                if param_name and param_name not in [p['name'] for p in input_params]:
+                if param_name and param_name not in input_param_names:
+                    input_param_names.add(param_name)
                     input_params.append({
                         'name': param_name,
                         'type': 'image',
@@ -1059,15 +2087,19 @@ class NodeCanvas(BaseWindow):
             input_params.append({'name': 'image', 'type': 'image', 'connectable': True})
         return input_params
     
-    def _extract_algorithm_outputs(self, pipeline_data: Dict[str, Any]) -> List[str]:
+    def _extract_algorithm_outputs(self, pipeline_data: Dict[str, Any], 
+                                   nodes_by_id: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
         """Extract output parameters from an embedded pipeline"""
+        if nodes_by_id is None:
+            nodes_by_id = {n['id']: n for n in pipeline_data.get('nodes', [])}
         output_params = []
+        output_param_names = set()
         for conn in pipeline_data.get('connections', []):
-            to_node_data = next((n for n in pipeline_data.get('nodes', []) 
-                               if n['id'] == conn['to_node']), None)
+            to_node_data = nodes_by_id.get(conn['to_node'])
             if to_node_data and to_node_data.get('node_type') == 'output':
                 output_name = conn.get('to_parameter', 'image')
-                if output_name not in output_params:
+                if output_name not in output_param_names:
+                    output_param_names.add(output_name)
                     output_params.append(output_name)
         if not output_params:
             output_params.append('image')
@@ -1,4 +1,5 @@
-from pygame import Rect, draw, font, mouse, MOUSEBUTTONDOWN, MOUSEWHEEL, MOUSEMOTION
+from contextlib import contextmanager
+from pygame import Rect, Surface, SRCALPHA, draw, font, mouse, MOUSEBUTTONDOWN, MOUSEWHEEL, MOUSEMOTION
 from windows.base_window import BaseWindow
 from typing import Tuple, List, Optional, Dict
 
@@ -42,6 +43,7 @@ class TabbedNodeViewer(BaseWindow):
     MIN_SCROLLBAR_HEIGHT = 20
     SCROLLBAR_WIDTH = 8
     SCROLLBAR_MARGIN = 10
+    PANEL_BORDER_WIDTH = 2
     TAB_BORDER_WIDTH = 1
     NODE_BORDER_WIDTH = 2
     NODE_BORDER_RADIUS = 5
@@ -50,8 +52,10 @@ class TabbedNodeViewer(BaseWindow):
     DESC_FONT_SIZE_REDUCTION = 4
     MIN_DESC_FONT_SIZE = 12
     CONTENT_TOP_PADDING = 10
+    CONTENT_CACHE_MAX_HEIGHT = 8192
     
     # Color constants
+    PANEL_BORDER_COLOR = (100, 100, 100)
     TAB_BORDER_COLOR = (80, 80, 80)
     NODE_BORDER_COLOR = (150, 150, 150)
     DESCRIPTION_TEXT_COLOR = (200, 200, 200)
@@ -123,7 +127,21 @@ class TabbedNodeViewer(BaseWindow):
         
         # Cache for optimization
         self._last_tab_calc: Optional[Tuple[int, int]] = None
-        self._content_rect_cache: Optional[Rect] = None
+        self._tab_order: List[str] = []
+        self._content_rect_cache = self._calculate_content_rect()
+        self._desc_font: Optional[font.Font] = None
+        self._desc_font_size = 0
+        self._text_cache: Dict[Tuple[str, int, Tuple[int, int, int]], Surface] = {}
+        self._node_rect_template = Rect(0, 0, 0, 0)
+        self._node_stride = self.node_height + self.node_padding
+        self._content_surface: Optional[Surface] = None
+        self._content_key: Optional[Tuple] = None
+        self._content_version = 0
+        self._last_hover_state: Optional[Tuple] = None
+        self._suspend_updates = False
+        self._scrollbar_rect: Optional[Rect] = None
+        self._scrollbar_rect_dirty = True
+        self._content_hovered: Optional[NodeTemplate] = None
         return
     
     def update_layout(self, window_size: Tuple[int, int]) -> None:
@@ -141,6 +159,12 @@ class TabbedNodeViewer(BaseWindow):
         self._update_tab_rects()
         self._update_visible_nodes()
         self._content_rect_cache = self._calculate_content_rect()
+        self._scrollbar_rect_dirty = True
+        desc_font_size = max(self.MIN_DESC_FONT_SIZE, self.font_size - self.DESC_FONT_SIZE_REDUCTION)
+        if self._desc_font is None or desc_font_size != self._desc_font_size:
+            self._desc_font = font.SysFont(None, desc_font_size)
+            self._desc_font_size = desc_font_size
+            self._text_cache.clear()
         return
     
     def handle_events(self, events: list) -> None:
@@ -163,9 +187,22 @@ class TabbedNodeViewer(BaseWindow):
         return
     
     def update(self) -> None:
-        """Update the tabbed node viewer state (called every frame)"""
+        """
+        Update the tabbed node viewer state (called every frame)
+        
+        Hover state is only recomputed when the mouse, the scroll position,
+        the shown nodes, the layout or the dragging state changed.
+        """
         mouse_pos = mouse.get_pos()
-        self._update_hovered_tab(mouse_pos)
+        hover_state = (mouse_pos, self.scroll_offset, self.active_category, 
+                       self._content_version, tuple(self.rect), self.dragging_node is None)
+        if hover_state == self._last_hover_state:
+            return
+        self._last_hover_state = hover_state
+        if mouse_pos[1] < self.rect.y + self.tab_height:
+            self._update_hovered_tab(mouse_pos)
+        else:
+            self.hovered_tab = None
         if not self.dragging_node:
             self._update_hovered_node(mouse_pos)
         return
@@ -177,10 +214,11 @@ class TabbedNodeViewer(BaseWindow):
         Args:
             surface: Pygame surface to draw on
         """
-        draw.rect(surface, self.background_color, self.rect)
-        draw.rect(surface, (100, 100, 100), self.rect, 2)
+        surface.fill(self.PANEL_BORDER_COLOR, self.rect)
+        surface.fill(self.background_color, self.rect.inflate(-2 * self.PANEL_BORDER_WIDTH, 
+                                                              -2 * self.PANEL_BORDER_WIDTH))
         self._draw_tabs(surface)
-        content_rect = self._content_rect_cache or self._calculate_content_rect()
+        content_rect = self._content_rect_cache
         self._draw_nodes(surface, content_rect)
         self._draw_scrollbar(surface, content_rect)
         return
@@ -216,7 +254,25 @@ class TabbedNodeViewer(BaseWindow):
         node = NodeTemplate(name, category, description, node_color)
         self.categories[category].append(node)
         self.nodes.append(node)
-        if category == self.active_category:
+        self._content_version += 1
+        if category == self.active_category and not self._suspend_updates:
+            self._update_visible_nodes()
+        return
+    
+    @contextmanager
+    def batch_add(self):
+        """
+        Defer visible node updates while many nodes are added
+        
+        Usage:
+            with viewer.batch_add():
+                viewer.add_node(...)
+        """
+        self._suspend_updates = True
+        try:
+            yield self
+        finally:
+            self._suspend_updates = False
             self._update_visible_nodes()
         return
     
@@ -249,6 +305,7 @@ class TabbedNodeViewer(BaseWindow):
             self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
             if self.active_category:
                 self.scroll_positions[self.active_category] = self.scroll_offset
+            self._scrollbar_rect_dirty = True
         return
     
     def _handle_mouse_down(self, event) -> None:
@@ -260,11 +317,11 @@ class TabbedNodeViewer(BaseWindow):
         """
         if event.button != 1:
             return
-        for category, tab_rect in self.tab_rects.items():
-            if tab_rect.collidepoint(event.pos):
-                self._switch_category(category)
-                return
-        content_rect = self._content_rect_cache or self._calculate_content_rect()
+        category = self._tab_at(event.pos)
+        if category is not None:
+            self._switch_category(category)
+            return
+        content_rect = self._content_rect_cache
         if content_rect.collidepoint(event.pos):
             self._check_node_click(event.pos)
         return
@@ -284,6 +341,7 @@ class TabbedNodeViewer(BaseWindow):
         self._update_visible_nodes()
         self.scroll_offset = self.scroll_positions.get(category, 0)
         self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
+        self._scrollbar_rect_dirty = True
         return
     
     def _check_node_click(self, click_pos: Tuple[int, int]) -> None:
@@ -293,23 +351,16 @@ class TabbedNodeViewer(BaseWindow):
         Args:
             click_pos: Mouse position where click occurred
         """
-        content_rect = self._content_rect_cache or self._calculate_content_rect()
-        y_offset = content_rect.y + self.CONTENT_TOP_PADDING - self.scroll_offset
-        for node in self.visible_nodes:
-            node_rect = Rect(
-                self.rect.x + self.node_padding,
-                y_offset,
-                self.rect.width - 2 * self.node_padding,
-                self.node_height
+        content_rect = self._content_rect_cache
+        index = self._node_index_at(click_pos, content_rect)
+        if index is not None:
+            node_rect = self._node_rect_template.move(
+                0, self._node_list_top(content_rect) + index * self._node_stride)
+            self.dragging_node = self.visible_nodes[index]
+            self.drag_offset = (
+                click_pos[0] - node_rect.x,
+                click_pos[1] - node_rect.y
             )
-            if node_rect.collidepoint(click_pos):
-                self.dragging_node = node
-                self.drag_offset = (
-                    click_pos[0] - node_rect.x,
-                    click_pos[1] - node_rect.y
-                )
-                break
-            y_offset += self.node_height + self.node_padding
         return
     
     def _update_hovered_tab(self, mouse_pos: Tuple[int, int]) -> None:
@@ -319,13 +370,33 @@ class TabbedNodeViewer(BaseWindow):
         Args:
             mouse_pos: Current mouse position
         """
-        self.hovered_tab = None
-        for category, tab_rect in self.tab_rects.items():
-            if tab_rect.collidepoint(mouse_pos):
-                self.hovered_tab = category
-                break
+        self.hovered_tab = self._tab_at(mouse_pos)
         return
     
+    def _tab_at(self, pos: Tuple[int, int]) -> Optional[str]:
+        """
+        Get the category whose tab is at a position
+        
+        Tabs are equal-width, so the index follows from the x position; the
+        neighbours are checked too because tab rects are rounded to pixels.
+        
+        Args:
+            pos: Screen position
+            
+        Returns:
+            Category name or None if no tab is at the position
+        """
+        tab_order = self._tab_order
+        if not tab_order or not self.rect.y <= pos[1] < self.rect.y + self.tab_height:
+            return None
+        index = (pos[0] - self.rect.x) * len(tab_order) // max(1, self.rect.width)
+        for candidate in (index, index - 1, index + 1):
+            if 0 <= candidate < len(tab_order):
+                category = tab_order[candidate]
+                if self.tab_rects[category].collidepoint(pos):
+                    return category
+        return None
+    
     def _update_hovered_node(self, mouse_pos: Tuple[int, int]) -> None:
         """
         Update which node is currently hovered
@@ -334,21 +405,12 @@ class TabbedNodeViewer(BaseWindow):
             mouse_pos: Current mouse position
         """
         self.hovered_node = None
-        content_rect = self._content_rect_cache or self._calculate_content_rect()
+        content_rect = self._content_rect_cache
         if not content_rect.collidepoint(mouse_pos):
             return
-        y_offset = content_rect.y + self.CONTENT_TOP_PADDING - self.scroll_offset
-        for node in self.visible_nodes:
-            node_rect = Rect(
-                self.rect.x + self.node_padding,
-                y_offset,
-                self.rect.width - 2 * self.node_padding,
-                self.node_height
-            )
-            if node_rect.collidepoint(mouse_pos):
-                self.hovered_node = node
-                break
-            y_offset += self.node_height + self.node_padding
+        index = self._node_index_at(mouse_pos, content_rect)
+        if index is not None:
+            self.hovered_node = self.visible_nodes[index]
         return
     
     def _update_tab_rects(self) -> None:
@@ -359,6 +421,7 @@ class TabbedNodeViewer(BaseWindow):
             self._last_tab_calc == (len(self.categories), self.rect.width)):
             return
         self.tab_rects = {}
+        self._tab_order = []
         if not self.categories:
             return
         num_tabs = len(self.categories)
@@ -367,6 +430,7 @@ class TabbedNodeViewer(BaseWindow):
             tab_x = self.rect.x + i * tab_width
             tab_rect = Rect(tab_x, self.rect.y, tab_width, self.tab_height)
             self.tab_rects[category] = tab_rect
+        self._tab_order = list(self.tab_rects)
         self._last_tab_calc = (len(self.categories), self.rect.width)
         return
     
@@ -378,19 +442,28 @@ class TabbedNodeViewer(BaseWindow):
             self.visible_nodes = self.categories.get(self.active_category, [])
         else:
             self.visible_nodes = []
-        content_height = len(self.visible_nodes) * (self.node_height + self.node_padding)
+        self._node_stride = self.node_height + self.node_padding
+        self._node_rect_template = Rect(self.rect.x + self.node_padding, 0,
+                                        self.rect.width - 2 * self.node_padding, self.node_height)
+        content_height = len(self.visible_nodes) * self._node_stride
         available_height = self.rect.height - self.tab_height - 2 * self.CONTENT_TOP_PADDING
         self.max_scroll = max(0, content_height - available_height)
         self.scroll_offset = min(self.scroll_offset, self.max_scroll)
+        self._scrollbar_rect_dirty = True
         return
     
     def _draw_tabs(self, surface) -> None:
         """
         Draw all category tabs
         
+        Each tab is filled with the border color and then its inset with the
+        tab color; the labels are blitted in one batch afterwards.
+        
         Args:
             surface: Pygame surface to draw on
         """
+        inset = -2 * self.TAB_BORDER_WIDTH
+        text_blits = []
         for category, tab_rect in self.tab_rects.items():
             if category == self.active_category:
                 color = self.tab_active_color
@@ -398,11 +471,11 @@ class TabbedNodeViewer(BaseWindow):
                 color = self.tab_hover_color
             else:
                 color = self.tab_color
-            draw.rect(surface, color, tab_rect)
-            draw.rect(surface, self.TAB_BORDER_COLOR, tab_rect, self.TAB_BORDER_WIDTH)
-            text = self.font.render(category, True, self.text_color)
-            text_rect = text.get_rect(center=tab_rect.center)
-            surface.blit(text, text_rect)
+            surface.fill(self.TAB_BORDER_COLOR, tab_rect)
+            surface.fill(color, tab_rect.inflate(inset, inset))
+            text = self._render_text(category, self.font, self.font_size, self.text_color)
+            text_blits.append((text, text.get_rect(center=tab_rect.center)))
+        surface.blits(text_blits, doreturn=False)
         return
     
     def _draw_nodes(self, surface, content_rect: Rect) -> None:
@@ -413,17 +486,88 @@ class TabbedNodeViewer(BaseWindow):
             surface: Pygame surface to draw on
             content_rect: Rectangle defining the content area
         """
+        content_surface = self._get_content_surface()
+        if content_surface is not None:
+            surface.blit(content_surface, content_rect.topleft, 
+                         Rect(0, self.scroll_offset, content_rect.width, content_rect.height))
+            return
         clip_rect = surface.get_clip()
         surface.set_clip(content_rect)
-        visible_items = self._get_visible_node_rects(content_rect)
-        for node, node_rect in visible_items:
-            self._draw_node(surface, node, node_rect)
+        self._draw_node_rows(surface, self._get_visible_node_rects(content_rect))
         surface.set_clip(clip_rect)
         return
     
-    def _draw_node(self, surface, node: NodeTemplate, rect: Rect) -> None:
+    def _get_content_surface(self) -> Optional[Surface]:
+        """
+        Get the whole node column of the active category pre-rendered
+        
+        The column is rebuilt when the category, its nodes or the layout
+        change; a hover change only redraws the two affected rows.
+        
+        Returns:
+            Transparent surface with all rows, or None if the column is too
+            tall to cache (rows are then drawn directly)
+        """
+        height = self.CONTENT_TOP_PADDING + len(self.visible_nodes) * self._node_stride
+        if height > self.CONTENT_CACHE_MAX_HEIGHT:
+            return None
+        key = (self.active_category, self._content_version, len(self.visible_nodes), self.rect.width, 
+               self.node_height, self.node_padding, self._desc_font_size)
+        if key != self._content_key:
+            self._content_surface = Surface((self.rect.width, height), SRCALPHA)
+            self._draw_node_rows(self._content_surface, 
+                                 [(node, self._content_row_rect(index)) 
+                                  for index, node in enumerate(self.visible_nodes)])
+            self._content_key = key
+            self._content_hovered = self.hovered_node
+        elif self.hovered_node is not self._content_hovered:
+            rows = []
+            for node in (self._content_hovered, self.hovered_node):
+                if node is not None and node in self.visible_nodes:
+                    row_rect = self._content_row_rect(self.visible_nodes.index(node))
+                    self._content_surface.fill((0, 0, 0, 0), row_rect)
+                    rows.append((node, row_rect))
+            self._draw_node_rows(self._content_surface, rows)
+            self._content_hovered = self.hovered_node
+        return self._content_surface
+    
+    def _content_row_rect(self, index: int) -> Rect:
         """
-        Draw a single node
+        Get the rect of a node row on the cached content surface
+        
+        Args:
+            index: Index into visible_nodes
+            
+        Returns:
+            Row rectangle in content surface coordinates
+        """
+        return Rect(self.node_padding, self.CONTENT_TOP_PADDING + index * self._node_stride,
+                    self._node_rect_template.width, self.node_height)
+    
+    def _draw_node_rows(self, surface, rows: List[Tuple[NodeTemplate, Rect]]) -> None:
+        """
+        Draw node rows, all shapes under one surface lock and then all text
+        
+        Args:
+            surface: Pygame surface to draw on
+            rows: List of tuples (node, rect)
+        """
+        if not rows:
+            return
+        surface.lock()
+        try:
+            for node, rect in rows:
+                self._draw_node_shape(surface, node, rect)
+        finally:
+            surface.unlock()
+        for node, rect in rows:
+            self._draw_node_text(surface, node, rect)
+        return
+    
+    def _draw_node_shape(self, surface, node: NodeTemplate, rect: Rect) -> None:
+        """
+        Draw the rounded body of a node as a border-colored rect with the
+        node color inset by the border width
         
         Args:
             surface: Pygame surface to draw on
@@ -431,19 +575,30 @@ class TabbedNodeViewer(BaseWindow):
             rect: Rectangle to draw the node in
         """
         color = self.node_hover_color if node == self.hovered_node else node.color
-        draw.rect(surface, color, rect, border_radius=self.NODE_BORDER_RADIUS)
-        draw.rect(surface, self.NODE_BORDER_COLOR, rect, self.NODE_BORDER_WIDTH, 
-                 border_radius=self.NODE_BORDER_RADIUS)
-        name_text = self.font.render(node.name, True, self.text_color)
+        inset = -2 * self.NODE_BORDER_WIDTH
+        draw.rect(surface, self.NODE_BORDER_COLOR, rect, border_radius=self.NODE_BORDER_RADIUS)
+        draw.rect(surface, color, rect.inflate(inset, inset), 
+                 border_radius=self.NODE_BORDER_RADIUS - self.NODE_BORDER_WIDTH)
+        return
+    
+    def _draw_node_text(self, surface, node: NodeTemplate, rect: Rect) -> None:
+        """
+        Draw the name and description of a node
+        
+        Args:
+            surface: Pygame surface to draw on
+            node: Node template to draw
+            rect: Rectangle the node is drawn in
+        """
+        name_text = self._render_text(node.name, self.font, self.font_size, self.text_color)
         name_rect = name_text.get_rect(
             centerx=rect.centerx,
             top=rect.y + self.NAME_TEXT_OFFSET
         )
         surface.blit(name_text, name_rect)
         if node.description:
-            desc_font_size = max(self.MIN_DESC_FONT_SIZE, self.font_size - self.DESC_FONT_SIZE_REDUCTION)
-            desc_font = font.SysFont(None, desc_font_size)
-            desc_text = desc_font.render(node.description, True, self.DESCRIPTION_TEXT_COLOR)
+            desc_text = self._render_text(node.description, self._desc_font, self._desc_font_size, 
+                                          self.DESCRIPTION_TEXT_COLOR)
             desc_rect = desc_text.get_rect(
                 centerx=rect.centerx,
                 top=name_rect.bottom + self.DESC_TEXT_OFFSET
@@ -451,15 +606,40 @@ class TabbedNodeViewer(BaseWindow):
             surface.blit(desc_text, desc_rect)
         return
     
+    def _render_text(self, text: str, text_font: font.Font, font_size: int, 
+                     color: Tuple[int, int, int]) -> Surface:
+        """
+        Render text once and reuse the surface on later frames
+        
+        Args:
+            text: Text to render
+            text_font: Font to render with
+            font_size: Size of text_font (part of the cache key)
+            color: RGB text color
+            
+        Returns:
+            Rendered text surface
+        """
+        key = (text, font_size, color)
+        text_surface = self._text_cache.get(key)
+        if text_surface is None:
+            text_surface = text_font.render(text, True, color)
+            self._text_cache[key] = text_surface
+        return text_surface
+    
     def _draw_scrollbar(self, surface, content_rect: Rect) -> None:
         """
-        Draw scrollbar if needed
+        Draw scrollbar if needed, recomputing its rect only after a scroll,
+        category or layout change
         
         Args:
             surface: Pygame surface to draw on
             content_rect: Rectangle defining the content area
         """
-        scrollbar_rect = self._calculate_scrollbar_rect(content_rect)
+        if self._scrollbar_rect_dirty:
+            self._scrollbar_rect = self._calculate_scrollbar_rect(content_rect)
+            self._scrollbar_rect_dirty = False
+        scrollbar_rect = self._scrollbar_rect
         if scrollbar_rect:
             draw.rect(surface, self.SCROLLBAR_COLOR, scrollbar_rect, 
                      border_radius=self.SCROLLBAR_BORDER_RADIUS)
@@ -489,19 +669,62 @@ class TabbedNodeViewer(BaseWindow):
         Returns:
             List of tuples (node, rect) for visible nodes only
         """
-        visible = []
-        y_offset = content_rect.y + self.CONTENT_TOP_PADDING - self.scroll_offset
-        for node in self.visible_nodes:
-            node_rect = Rect(
-                self.rect.x + self.node_padding,
-                y_offset,
-                self.rect.width - 2 * self.node_padding,
-                self.node_height
-            )
-            if not (node_rect.bottom < content_rect.y or node_rect.top > content_rect.bottom):
-                visible.append((node, node_rect))
-            y_offset += self.node_height + self.node_padding
-        return visible
+        template = self._node_rect_template
+        stride = self._node_stride
+        top = self._node_list_top(content_rect)
+        first, last = self._visible_index_range(content_rect)
+        return [(self.visible_nodes[i], template.move(0, top + i * stride)) 
+                for i in range(first, last)]
+    
+    def _node_list_top(self, content_rect: Rect) -> int:
+        """
+        Get the screen y of the first node row at the current scroll offset
+        
+        Args:
+            content_rect: Rectangle defining the content area
+            
+        Returns:
+            Top of row 0 in screen coordinates
+        """
+        return content_rect.y + self.CONTENT_TOP_PADDING - self.scroll_offset
+    
+    def _visible_index_range(self, content_rect: Rect) -> Tuple[int, int]:
+        """
+        Get the rows that overlap the content area from the uniform row stride
+        
+        Args:
+            content_rect: Rectangle defining the content area
+            
+        Returns:
+            Tuple (first, last) for range(first, last) over visible_nodes
+        """
+        top = self._node_list_top(content_rect)
+        stride = self._node_stride
+        first = max(0, -((top + self.node_height - content_rect.y) // stride))
+        last = min(len(self.visible_nodes), (content_rect.bottom - top) // stride + 1)
+        return first, max(first, last)
+    
+    def _node_index_at(self, pos: Tuple[int, int], content_rect: Rect) -> Optional[int]:
+        """
+        Get the index of the node row under a position
+        
+        Args:
+            pos: Screen position
+            content_rect: Rectangle defining the content area
+            
+        Returns:
+            Index into visible_nodes, or None if no node is at the position
+        """
+        template = self._node_rect_template
+        if not template.left <= pos[0] < template.right:
+            return None
+        row_y = pos[1] - self._node_list_top(content_rect)
+        index = row_y // self._node_stride
+        if not 0 <= index < len(self.visible_nodes):
+            return None
+        if row_y - index * self._node_stride >= self.node_height:
+            return None
+        return index
     
     def _calculate_scrollbar_rect(self, content_rect: Rect) -> Optional[Rect]:
         """
@@ -515,7 +738,7 @@ class TabbedNodeViewer(BaseWindow):
         """
         if self.max_scroll <= 0:
             return None
-        total_height = len(self.visible_nodes) * (self.node_height + self.node_padding)
+        total_height = len(self.visible_nodes) * self._node_stride
         scrollbar_height = max(
             self.MIN_SCROLLBAR_HEIGHT,
             int(content_rect.height * (content_rect.height / total_height))